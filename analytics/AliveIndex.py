@@ -0,0 +1,183 @@
+import numpy as np
+import pandas as pd
+
+
+class AliveIndex:
+    """
+    Interval index over creature lifetimes from the creatures table.
+    A creature is alive at t when birth_time <= t <= death_time (no death_time means still alive).
+
+    Built once; point, range and bulk-timestep queries then run in logarithmic time
+    (plus the size of the answer) instead of filtering the whole table per timestep.
+    """
+
+    def __init__(self, creatures):
+        self.creatures = creatures.reset_index(drop=True)
+        self.births = self.creatures["birth_time"].to_numpy(dtype=float)
+        deaths = self.creatures["death_time"].to_numpy(dtype=float)
+        self.deaths = np.where(np.isnan(deaths), np.inf, deaths)
+
+        # sweep line: sorted event times for counting and prefix sums
+        self._birth_order = np.argsort(self.births, kind="stable")
+        self._death_order = np.argsort(self.deaths, kind="stable")
+        self._sorted_births = self.births[self._birth_order]
+        self._sorted_deaths = self.deaths[self._death_order]
+
+        # centered interval tree for stabbing queries that return rows
+        self._root = _IntervalNode.build(np.arange(len(self.births)), self.births, self.deaths)
+
+        self._prefix_cache = {}
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls(pd.read_csv(path))
+
+    def __len__(self):
+        return len(self.births)
+
+    # --- single queries ---
+
+    def alive_at(self, t):
+        """ Row positions of creatures alive at time t """
+        out = []
+        if self._root is not None:
+            self._root.stab(t, out)
+        if not out:
+            return np.empty(0, dtype=int)
+        return np.sort(np.concatenate(out))
+
+    def alive_between(self, t0, t1):
+        """ Row positions of creatures alive at any point in [t0, t1] """
+        # alive during the range = alive at t0, plus everyone born in (t0, t1]
+        at_start = self.alive_at(t0)
+        lo = np.searchsorted(self._sorted_births, t0, side="right")
+        hi = np.searchsorted(self._sorted_births, t1, side="right")
+        born_during = self._birth_order[lo:hi]
+        return np.sort(np.concatenate([at_start, born_during]))
+
+    def snapshot(self, t):
+        """ DataFrame of creatures alive at time t """
+        return self.creatures.iloc[self.alive_at(t)]
+
+    def snapshot_between(self, t0, t1):
+        """ DataFrame of creatures alive at any point in [t0, t1] """
+        return self.creatures.iloc[self.alive_between(t0, t1)]
+
+    def count_at(self, t):
+        return int(self.alive_counts([t])[0])
+
+    # --- bulk queries ---
+
+    def alive_counts(self, timesteps):
+        """ Number of creatures alive at each timestep """
+        timesteps = np.asarray(timesteps, dtype=float)
+        born = np.searchsorted(self._sorted_births, timesteps, side="right")
+        died = np.searchsorted(self._sorted_deaths, timesteps, side="left")
+        return born - died
+
+    def column_curve(self, column, timesteps, stat="mean"):
+        """
+        Statistic of a column over living creatures at each timestep.
+        stat is one of "sum", "count", "mean" or "var" (population variance). Missing values are ignored.
+        """
+        timesteps = np.asarray(timesteps, dtype=float)
+        sum_births, sum_deaths = self._prefix_sums(column, 1)
+        cnt_births, cnt_deaths = self._prefix_sums(column, 0)
+
+        born = np.searchsorted(self._sorted_births, timesteps, side="right")
+        died = np.searchsorted(self._sorted_deaths, timesteps, side="left")
+        total = sum_births[born] - sum_deaths[died]
+        count = cnt_births[born] - cnt_deaths[died]
+
+        if stat == "sum":
+            return total
+        if stat == "count":
+            return count
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+            if stat == "mean":
+                return mean
+            if stat == "var":
+                sq_births, sq_deaths = self._prefix_sums(column, 2)
+                total_sq = sq_births[born] - sq_deaths[died]
+                var = np.where(count > 0, total_sq / count - mean * mean, np.nan)
+                return np.maximum(var, 0.0)
+        raise ValueError(f"Unknown stat: {stat}")
+
+    def curves(self, columns, timesteps, stat="mean"):
+        """ DataFrame with one column_curve per column, indexed by timestep """
+        timesteps = np.asarray(timesteps, dtype=float)
+        data = {column: self.column_curve(column, timesteps, stat) for column in columns}
+        data["num_alive"] = self.alive_counts(timesteps)
+        return pd.DataFrame(data, index=pd.Index(timesteps, name="time"))
+
+    def _prefix_sums(self, column, power):
+        """ Cumulative sums of column**power in birth order and in death order, with a leading zero """
+        key = (column, power)
+        if key not in self._prefix_cache:
+            values = self.creatures[column].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            if power == 0:
+                values = valid.astype(float)
+            else:
+                values = np.where(valid, values ** power, 0.0)
+            by_birth = np.concatenate([[0.0], np.cumsum(values[self._birth_order])])
+            by_death = np.concatenate([[0.0], np.cumsum(values[self._death_order])])
+            self._prefix_cache[key] = (by_birth, by_death)
+        return self._prefix_cache[key]
+
+
+class _IntervalNode:
+    """ Node of a centered interval tree over [start, end] intervals """
+
+    def __init__(self, center, by_start, starts, by_end, ends, left, right):
+        self.center = center
+        self.by_start = by_start  # intervals containing center, sorted by start ascending
+        self.starts = starts
+        self.by_end = by_end  # same intervals, sorted by end descending
+        self.neg_ends = -ends  # negated so searchsorted works on an ascending array
+        self.left = left
+        self.right = right
+
+    @classmethod
+    def build(cls, idx, starts, ends):
+        if len(idx) == 0:
+            return None
+        s = starts[idx]
+        e = ends[idx]
+        center = np.median(np.concatenate([s, e[np.isfinite(e)]]))
+
+        left_mask = e < center
+        right_mask = s > center
+        here = idx[~left_mask & ~right_mask]
+
+        start_order = np.argsort(starts[here], kind="stable")
+        end_order = np.argsort(-ends[here], kind="stable")
+        by_start = here[start_order]
+        by_end = here[end_order]
+
+        return cls(
+            center,
+            by_start, starts[by_start],
+            by_end, ends[by_end],
+            cls.build(idx[left_mask], starts, ends),
+            cls.build(idx[right_mask], starts, ends),
+        )
+
+    def stab(self, t, out):
+        node = self
+        while node is not None:
+            if t < node.center:
+                # intervals here end after center > t, so they contain t iff they start by t
+                n = np.searchsorted(node.starts, t, side="right")
+                out.append(node.by_start[:n])
+                node = node.left
+            elif t > node.center:
+                # intervals here start before center < t, so they contain t iff they end at or after t
+                n = np.searchsorted(node.neg_ends, -t, side="right")
+                out.append(node.by_end[:n])
+                node = node.right
+            else:
+                out.append(node.by_start)
+                return
@@ -0,0 +1,276 @@
+import numpy as np
+import pandas as pd
+
+
+class LineageIndex:
+    """
+    Ancestry index over creatures, stored as compact parent arrays keyed by a dense index.
+
+    Binary lifting tables give O(log n) k-th ancestor and lowest common ancestor queries and are
+    extended as creatures are added, so the index can be built incrementally while the simulation runs.
+    Euler tour ranges (descendant queries) and subtree sizes are rebuilt lazily after additions.
+    Creatures must be added after their parent, which holds for simulation ids and the creatures table.
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self._index = {}  # creature id -> dense index
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.parent = np.zeros(capacity, dtype=np.int64)  # dense index of parent, self for founders
+        self.depth = np.zeros(capacity, dtype=np.int64)  # generations below the founder
+        self.founder = np.zeros(capacity, dtype=np.int64)  # dense index of the founder
+        self.birth = np.zeros(capacity, dtype=float)
+        self.death = np.full(capacity, np.inf)
+        self.up = [self.parent]  # up[k][i] = 2^k-th ancestor of i, clamped at the founder
+
+        self._tour_dirty = True
+        self._survival_cache = {}
+
+    @classmethod
+    def from_dataframe(cls, creatures):
+        """ Build from a creatures table with id, parent, birth_time and death_time columns """
+        creatures = creatures.sort_values("id")
+        index = cls(capacity=max(1, len(creatures)))
+        parents = creatures["parent"].to_numpy(dtype=float)
+        deaths = creatures["death_time"].to_numpy(dtype=float)
+        for creature_id, parent, birth, death in zip(creatures["id"].to_numpy(), parents, creatures["birth_time"].to_numpy(dtype=float), deaths):
+            index.add_creature(int(creature_id), None if np.isnan(parent) else int(parent), birth)
+            if not np.isnan(death):
+                index.death[index.size - 1] = death
+        return index
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls.from_dataframe(pd.read_csv(path))
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, creature_id):
+        return creature_id in self._index
+
+    # --- incremental building ---
+
+    def add_creature(self, creature_id, parent_id, birth_time):
+        """ Add a creature. parent_id of None (or an unknown id) makes it a founder """
+        if self.size == len(self.ids):
+            self._grow()
+
+        i = self.size
+        p = self._index.get(parent_id, i) if parent_id is not None else i
+        self._index[creature_id] = i
+        self.ids[i] = creature_id
+        self.parent[i] = p
+        self.depth[i] = 0 if p == i else self.depth[p] + 1
+        self.founder[i] = i if p == i else self.founder[p]
+        self.birth[i] = birth_time
+        self.death[i] = np.inf
+
+        # extend the binary lifting tables; the parent's rows are already complete
+        for k in range(1, len(self.up)):
+            self.up[k][i] = self.up[k - 1][self.up[k - 1][i]]
+        while self.depth[i] >= 1 << len(self.up):
+            self._add_level()
+
+        self.size += 1
+        self._tour_dirty = True
+        self._survival_cache.clear()
+
+    def mark_creature_dead(self, creature_id, time):
+        self.death[self._index[creature_id]] = time
+        self._survival_cache.clear()
+
+    def _grow(self):
+        capacity = 2 * len(self.ids)
+        self.ids = np.resize(self.ids, capacity)
+        self.parent = np.resize(self.parent, capacity)
+        self.depth = np.resize(self.depth, capacity)
+        self.founder = np.resize(self.founder, capacity)
+        self.birth = np.resize(self.birth, capacity)
+        self.death = np.resize(self.death, capacity)
+        self.up = [self.parent] + [np.resize(level, capacity) for level in self.up[1:]]
+
+    def _add_level(self):
+        prev = self.up[-1]
+        level = np.zeros_like(prev)
+        n = self.size + 1
+        level[:n] = prev[prev[:n]]
+        self.up.append(level)
+
+    # --- ancestry queries ---
+
+    def _i(self, creature_id):
+        return self._index[creature_id]
+
+    def parent_of(self, creature_id):
+        i = self._i(creature_id)
+        p = self.parent[i]
+        return None if p == i else int(self.ids[p])
+
+    def founder_of(self, creature_id):
+        return int(self.ids[self.founder[self._i(creature_id)]])
+
+    def generation_depth(self, creature_id):
+        """ Number of generations between a creature and its founder """
+        return int(self.depth[self._i(creature_id)])
+
+    def _kth_ancestor(self, i, k):
+        level = 0
+        while k and level < len(self.up):
+            if k & 1:
+                i = self.up[level][i]
+            k >>= 1
+            level += 1
+        return i
+
+    def ancestor(self, creature_id, k):
+        """ The k-th ancestor of a creature, or None if it has fewer than k ancestors """
+        i = self._i(creature_id)
+        if k > self.depth[i]:
+            return None
+        return int(self.ids[self._kth_ancestor(i, k)])
+
+    def ancestors(self, creature_id):
+        """ Ancestor ids from parent up to founder """
+        out = []
+        i = self._i(creature_id)
+        while self.parent[i] != i:
+            i = self.parent[i]
+            out.append(int(self.ids[i]))
+        return out
+
+    def _lca(self, a, b):
+        if self.founder[a] != self.founder[b]:
+            return -1
+        if self.depth[a] < self.depth[b]:
+            a, b = b, a
+        a = self._kth_ancestor(a, self.depth[a] - self.depth[b])
+        if a == b:
+            return a
+        for level in reversed(self.up):
+            if level[a] != level[b]:
+                a = level[a]
+                b = level[b]
+        return self.parent[a]
+
+    def lca(self, a_id, b_id):
+        """ Most recent common ancestor of two creatures (a creature is its own ancestor), or None """
+        i = self._lca(self._i(a_id), self._i(b_id))
+        return None if i < 0 else int(self.ids[i])
+
+    def lca_many(self, creature_ids):
+        """ Most recent common ancestor of a group of creatures, or None if they span several founders """
+        result = None
+        for creature_id in creature_ids:
+            i = self._i(creature_id)
+            result = i if result is None else self._lca(result, i)
+            if result < 0:
+                return None
+        return None if result is None else int(self.ids[result])
+
+    def is_ancestor(self, ancestor_id, creature_id):
+        """ True if ancestor_id is creature_id or one of its ancestors """
+        self._build_tour()
+        a = self._i(ancestor_id)
+        tin = self._tin[self._i(creature_id)]
+        return self._tin[a] <= tin < self._tin[a] + self._subtree[a]
+
+    # --- subtree queries ---
+
+    def _build_tour(self):
+        """ Preorder (Euler tour entry) positions and subtree sizes for every creature """
+        if not self._tour_dirty:
+            return
+        n = self.size
+        parent = self.parent[:n]
+
+        subtree = np.ones(n, dtype=np.int64)
+        for i in range(n - 1, -1, -1):  # children always have larger indices than parents
+            p = parent[i]
+            if p != i:
+                subtree[p] += subtree[i]
+
+        children = [[] for _ in range(n)]
+        roots = []
+        for i in range(n):
+            p = parent[i]
+            if p == i:
+                roots.append(i)
+            else:
+                children[p].append(i)
+
+        preorder = np.empty(n, dtype=np.int64)
+        tin = np.empty(n, dtype=np.int64)
+        pos = 0
+        stack = list(reversed(roots))
+        while stack:
+            i = stack.pop()
+            tin[i] = pos
+            preorder[pos] = i
+            pos += 1
+            stack.extend(reversed(children[i]))
+
+        self._subtree = subtree
+        self._preorder = preorder
+        self._tin = tin
+        self._tour_dirty = False
+
+    def subtree_size(self, creature_id):
+        """ Number of creatures descended from creature_id, including itself """
+        self._build_tour()
+        return int(self._subtree[self._i(creature_id)])
+
+    def _descendant_indices(self, i):
+        self._build_tour()
+        start = self._tin[i]
+        return self._preorder[start:start + self._subtree[i]]
+
+    def descendants(self, creature_id, include_self=False):
+        """ Ids of every descendant of creature_id """
+        out = self.ids[self._descendant_indices(self._i(creature_id))]
+        return out if include_self else out[1:]
+
+    def alive_at(self, t):
+        """ Ids of creatures alive at time t """
+        n = self.size
+        alive = (self.birth[:n] <= t) & (self.death[:n] >= t)
+        return self.ids[:n][alive]
+
+    def founders(self):
+        n = self.size
+        return self.ids[:n][self.parent[:n] == np.arange(n)]
+
+    # --- survival curves ---
+
+    def lineage_survival(self, timesteps, creature_ids=None):
+        """
+        Living descendant count of each lineage at each timestep.
+        creature_ids defaults to the founders. Returns a DataFrame indexed by timestep with one column per lineage.
+        """
+        timesteps = np.asarray(timesteps, dtype=float)
+        if creature_ids is None:
+            creature_ids = self.founders()
+
+        columns = {}
+        for creature_id in creature_ids:
+            creature_id = int(creature_id)
+            births, deaths = self._lineage_events(creature_id)
+            born = np.searchsorted(births, timesteps, side="right")
+            died = np.searchsorted(deaths, timesteps, side="left")
+            columns[creature_id] = born - died
+        return pd.DataFrame(columns, index=pd.Index(timesteps, name="time"))
+
+    def _lineage_events(self, creature_id):
+        """ Sorted birth and death times of every member of a lineage, cached until the index changes """
+        if creature_id not in self._survival_cache:
+            members = self._descendant_indices(self._i(creature_id))
+            self._survival_cache[creature_id] = (np.sort(self.birth[members]), np.sort(self.death[members]))
+        return self._survival_cache[creature_id]
+
+    def dominant_founder(self, t):
+        """ (founder id, living descendants) for the founder lineage with the most creatures alive at time t """
+        counts = self.lineage_survival([t]).iloc[0]
+        if counts.max() <= 0:
+            return None, 0
+        founder = counts.idxmax()
+        return int(founder), int(counts[founder])
@@ -0,0 +1,146 @@
+"""
+Compares control intervals (creatures sensing and thinking every k ticks) on the README report scenarios.
+
+For each scenario and k the simulation runs headless from the same seed and reports throughput next to evolutionary
+outcomes: population, births, generations, mean genes and brain size of the survivors. Every run is its own
+process, since the scenario toggles are read from config when the simulation modules are imported.
+
+Run from the repository root:
+    python -m benchmarks.control_rate
+    python -m benchmarks.control_rate --scenarios desert_1 forest_1 --intervals 1 2 4 --minutes 5
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from config import SEED
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_INTERVALS = [1, 2, 3, 4]
+DEFAULT_MINUTES = 10
+FIXED_DT = 1.0 / 60.0
+
+DESERT = {"IS_FOREST": False, "NUM_INIT_FOOD": 500, "ENERGY_DENSITY": 0.5, "FOOD_RADIUS": 15, "NUM_INIT_FORESTS": 0}
+FOREST = {"IS_FOREST": True, "NUM_INIT_FOOD": 3750, "ENERGY_DENSITY": 0.15, "FOOD_RADIUS": 10, "NUM_INIT_FORESTS": 4}
+LIMITED = {"IS_LIMITED": True, "NUM_INPUTS": 10}
+UNLIMITED = {"IS_LIMITED": False, "NUM_INPUTS": 16}
+
+# The report scenarios from the README, as config overrides (including the food settings IS_FOREST selects)
+SCENARIOS = {
+    "desert_1": {**DESERT, "DAMAGE_SCALAR": 0.0, **LIMITED},
+    "desert_2": {**DESERT, "DAMAGE_SCALAR": 0.2, **LIMITED},
+    "desert_3": {**DESERT, "DAMAGE_SCALAR": 0.2, **UNLIMITED},
+    "forest_1": {**FOREST, "DAMAGE_SCALAR": 0.0, **LIMITED},
+    "forest_2": {**FOREST, "DAMAGE_SCALAR": 0.2, **LIMITED},
+    "forest_3": {**FOREST, "DAMAGE_SCALAR": 0.2, **UNLIMITED},
+}
+
+REPORTED_GENES = ["max_speed", "radius", "viewable_distance", "fov"]
+
+
+def run_one(scenario, control_interval, minutes, seed):
+    """ Run one scenario at one control interval in this process and return its measurements """
+    import config
+    for name, value in SCENARIOS[scenario].items():
+        setattr(config, name, value)
+
+    # imported after patching config, the simulation modules copy its values at import
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    import pygame
+    from entities.Genome import Genome
+    from telemetry.NullDatastore import NullDatastore
+    from world.Simulation import Simulation
+
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    random.seed(seed)
+    simulation = Simulation(config.SIMULATION_WIDTH, config.SIMULATION_HEIGHT, NullDatastore(), control_interval=control_interval)
+    simulation.stop_at_hour = False
+    simulation.initialize()
+
+    ticks = int(round(minutes * 60 / FIXED_DT))
+    population_sum = 0
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.update(FIXED_DT)
+        population_sum += len(simulation.creatures)
+    elapsed = time.perf_counter() - start
+
+    creatures = simulation.creatures
+    genes = simulation.gene_matrix().mean(axis=0) if creatures else None
+    return {
+        "scenario": scenario,
+        "control_interval": control_interval,
+        "seed": seed,
+        "ticks": ticks,
+        "ticks_per_sec": ticks / elapsed,
+        "final_population": len(creatures),
+        "mean_population": population_sum / ticks,
+        "births": simulation.next_creature_id - 1 - simulation.num_init_creature,
+        "max_generation": max((c.generation for c in creatures), default=0),
+        "mean_generation": sum(c.generation for c in creatures) / len(creatures) if creatures else 0,
+        "mean_brain_nodes": sum(c.num_brain_nodes for c in creatures) / len(creatures) if creatures else 0,
+        "mean_genes": {name: float(genes[Genome.gene_names.index(name)]) if genes is not None else None for name in REPORTED_GENES},
+    }
+
+
+def print_report(results):
+    print(f"{'scenario':<10} {'k':>3} {'ticks/s':>9} {'speedup':>8} {'final pop':>10} {'mean pop':>9} {'births':>7} "
+          f"{'max gen':>8} {'brain':>6} " + " ".join(f"{name:>18}" for name in REPORTED_GENES))
+    baseline = {}
+    for r in results:
+        if r["control_interval"] == 1:
+            baseline[r["scenario"], r["seed"]] = r["ticks_per_sec"]
+    for r in results:
+        base = baseline.get((r["scenario"], r["seed"]))
+        speedup = f"{r['ticks_per_sec'] / base:.2f}x" if base else "-"
+        genes = " ".join(f"{value:>18.2f}" if value is not None else f"{'-':>18}" for value in r["mean_genes"].values())
+        print(f"{r['scenario']:<10} {r['control_interval']:>3} {r['ticks_per_sec']:>9.1f} {speedup:>8} {r['final_population']:>10} "
+              f"{r['mean_population']:>9.1f} {r['births']:>7} {r['max_generation']:>8} {r['mean_brain_nodes']:>6.1f} {genes}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput and evolutionary outcomes at different control intervals")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--intervals", type=int, nargs="+", default=DEFAULT_INTERVALS, help="control intervals (k) to compare")
+    parser.add_argument("--minutes", type=float, default=DEFAULT_MINUTES, help="simulated minutes per run")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[SEED])
+    parser.add_argument("--output", help="results json path (default: benchmarks/results/control_rate_<time>.json)")
+    parser.add_argument("--single", nargs=3, metavar=("SCENARIO", "K", "SEED"), help=argparse.SUPPRESS)  # run one and print json
+    args = parser.parse_args(argv)
+
+    if args.single:
+        scenario, k, seed = args.single
+        print(json.dumps(run_one(scenario, int(k), args.minutes, int(seed))))
+        return 0
+
+    results = []
+    for scenario in args.scenarios:
+        for seed in args.seeds:
+            for k in args.intervals:
+                print(f"Running {scenario} seed {seed} k={k}...", flush=True)
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.control_rate", "--single", scenario, str(k), str(seed),
+                     "--minutes", str(args.minutes)],
+                    check=True, stdout=subprocess.PIPE, text=True,
+                ).stdout
+                results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print()
+    print_report(results)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("control_rate_%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"minutes": args.minutes, "results": results}, f, indent=2)
+    print(f"Saved results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
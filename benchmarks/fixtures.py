@@ -0,0 +1,121 @@
+"""
+Seeded fixtures shared by the benchmarks.
+Every builder takes a seed so fixtures are identical between runs and machines.
+"""
+import os
+import random
+
+import pygame
+
+from entities.Brain import Brain
+from entities.Creature import Creature
+from entities.Food import Food
+from entities.Genome import Genome
+from spacial.Point import Point
+from spacial.QuadTree import QuadTree
+from spacial.SpacialHashGrid import SpatialHashGrid
+from telemetry.NullDatastore import NullDatastore
+from world.Camera import Camera
+from world.Simulation import Simulation
+from config import NUM_INPUTS, NUM_OUTPUTS, SIMULATION_WIDTH, SIMULATION_HEIGHT, FOOD_RADIUS
+
+DESERT_FOOD = 500
+FOREST_FOOD = 3750
+GRID_CELL_SIZE = 100
+SCREEN_SIZE = (1280, 720)
+
+
+def init_headless_pygame():
+    """ Sprites are converted for the display, so a (hidden) display must exist before creatures are built """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if not pygame.get_init():
+        pygame.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def make_brain(hidden_nodes, seed=0):
+    """ Brain with the default random connections plus the given number of hidden nodes """
+    random.seed(seed)
+    brain = Brain(NUM_INPUTS, NUM_OUTPUTS)
+    while len(brain.nodes) < NUM_INPUTS + NUM_OUTPUTS + hidden_nodes:
+        brain.add_random_node()
+        brain.add_random_connection()
+    brain.topological_sort()
+    return brain
+
+
+def make_brain_inputs(seed=0):
+    rng = random.Random(seed)
+    return [1] + [rng.uniform(-1, 1) for _ in range(NUM_INPUTS - 2)] + [30.0]
+
+
+def make_food_field(count, seed=0, width=SIMULATION_WIDTH, height=SIMULATION_HEIGHT):
+    """ QuadTree of uniformly scattered food, built like Simulation.food """
+    init_headless_pygame()
+    rng = random.Random(seed)
+    tree = QuadTree(Point(0, 0), Point(width, height), 10, 10)
+    for _ in range(count):
+        tree.insert(Food(Point(rng.random() * width, rng.random() * height), FOOD_RADIUS))
+    return tree
+
+
+def make_food_spawner(num_forests=4, seed=0):
+    """ Simulation with forests (as in the forest world) and an empty food QuadTree, for spawning benchmarks """
+    init_headless_pygame()
+    random.seed(seed)
+    simulation = Simulation(SIMULATION_WIDTH, SIMULATION_HEIGHT, NullDatastore())
+    simulation.food_spawner.initialize_forests(num_forests)
+    return simulation
+
+
+def make_creature(creature_id=1, pos=None, seed=0):
+    init_headless_pygame()
+    random.seed(seed)
+    if pos is None:
+        pos = Point(SIMULATION_WIDTH / 2, SIMULATION_HEIGHT / 2)
+    return Creature(creature_id, pos, Genome.create_default())
+
+
+def make_crowd(count, seed=0, width=SIMULATION_WIDTH, height=SIMULATION_HEIGHT):
+    """ Creatures scattered uniformly over the world, with movement outputs set as if they had thought once """
+    init_headless_pygame()
+    rng = random.Random(seed)
+    random.seed(seed)
+    crowd = []
+    for i in range(count):
+        c = Creature(i + 1, Point(rng.random() * width, rng.random() * height), Genome.create_default())
+        c.speed = rng.random() * c.genome.max_speed
+        crowd.append(c)
+    return crowd
+
+
+def make_grid(creatures, cell_size=GRID_CELL_SIZE):
+    grid = SpatialHashGrid(cell_size)
+    for c in creatures:
+        grid.insert(c, c.pos.x, c.pos.y)
+    return grid
+
+
+def random_points(count, seed=0, width=SIMULATION_WIDTH, height=SIMULATION_HEIGHT):
+    rng = random.Random(seed)
+    return [Point(rng.random() * width, rng.random() * height) for _ in range(count)]
+
+
+def make_render_target(zoom=1.0):
+    """ Offscreen screen-sized surface and a camera whose view starts at the world origin """
+    init_headless_pygame()
+    camera = Camera(SIMULATION_WIDTH, SIMULATION_HEIGHT)
+    camera.zoom = zoom
+    # world_to_screen centres on the (1x1) display, so this puts world (0, 0) at the surface's top left
+    camera.x = camera.y = 0
+    return pygame.Surface(SCREEN_SIZE), camera
+
+
+def vary_colors(creatures, seed=0):
+    """ Give each creature its own colour, as in an evolved population """
+    rng = random.Random(seed)
+    for c in creatures:
+        for name in ("color_r", "color_g", "color_b"):
+            meta = Genome.gene_metadata[name]
+            setattr(c.genome, name, rng.uniform(meta["min"], meta["max"]))
@@ -0,0 +1,118 @@
+"""
+Memory per entity: builds many seeded instances of each entity type and divides the memory tracemalloc saw them
+allocate by the count. Genomes have every gene moved off its default, as after some evolution. Creatures are
+measured without their brain (one brain is shared), so the number is the creature itself plus its position and genome.
+
+Run from the repository root:
+    python -m benchmarks.memory_benchmark
+    python -m benchmarks.memory_benchmark --count 50000 --baseline benchmarks/results/memory_before.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks import fixtures
+from benchmarks.micro_benchmarks import git_commit
+from entities.Creature import Creature
+from entities.Food import Food
+from entities.Forest import Forest
+from entities.Genome import Genome
+from spacial.Point import Point
+from config import FOOD_RADIUS
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_COUNT = 20000
+
+ENTITIES = {}  # name -> builder(rng, shared) returning one entity
+
+
+def entity(name):
+    def register(builder):
+        ENTITIES[name] = builder
+        return builder
+    return register
+
+
+@entity("point")
+def _point(rng, shared):
+    return Point(rng.random(), rng.random())
+
+
+def _evolved_genome(rng):
+    """ A genome whose genes have all drifted from their defaults, as in a population that has been evolving """
+    genome = Genome.create_default()
+    for name, meta in Genome.gene_metadata.items():
+        setattr(genome, name, rng.uniform(meta["min"], meta["max"]))
+    return genome
+
+
+@entity("genome")
+def _genome(rng, shared):
+    return _evolved_genome(rng)
+
+
+@entity("food")
+def _food(rng, shared):
+    return Food(Point(rng.random(), rng.random()), FOOD_RADIUS)
+
+
+@entity("forest")
+def _forest(rng, shared):
+    return Forest(Point(rng.random(), rng.random()), rng.randint(1, 3), rng.random(), rng.random())
+
+
+@entity("creature")
+def _creature(rng, shared):
+    return Creature(1, Point(rng.random(), rng.random()), _evolved_genome(rng), brain=shared["brain"], direction=0.0)
+
+
+def bytes_per_entity(builder, count, shared, seed=0):
+    rng = random.Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [builder(rng, shared) for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding them is one pointer per entity
+    return (after - before - sys.getsizeof(entities)) / len(entities)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory per simulation entity")
+    parser.add_argument("--count", type=int, default=DEFAULT_COUNT, help="instances built per entity type")
+    parser.add_argument("--output", help="results json path (default: benchmarks/results/memory_<time>.json)")
+    parser.add_argument("--baseline", help="results json to compare against")
+    args = parser.parse_args(argv)
+
+    fixtures.init_headless_pygame()
+    shared = {"brain": fixtures.make_brain(0)}
+    Food._load_sprite(FOOD_RADIUS)
+
+    results = {}
+    for name, builder in ENTITIES.items():
+        results[name] = {"bytes": bytes_per_entity(builder, args.count, shared)}
+        print(f"{name:<12} {results[name]['bytes']:>10,.1f} bytes")
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("memory_%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"meta": {"commit": git_commit(), "count": args.count}, "results": results}, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        print(f"\n{'entity':<12} {'baseline':>10} {'current':>10} {'change':>8}")
+        for name, current in results.items():
+            if name in baseline:
+                before, after = baseline[name]["bytes"], current["bytes"]
+                print(f"{name:<12} {before:>10,.1f} {after:>10,.1f} {after / before - 1:>+8.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
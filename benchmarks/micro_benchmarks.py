@@ -0,0 +1,382 @@
+"""
+Microbenchmarks for the hot primitives of the simulation.
+
+Run from the repository root:
+    python -m benchmarks.micro_benchmarks                      # run everything, save results
+    python -m benchmarks.micro_benchmarks -k brain            # only benchmarks whose name contains "brain"
+    python -m benchmarks.micro_benchmarks --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks import fixtures
+from entities.Genome import Genome
+from world.FoodRenderer import FoodRenderer
+from spacial.Point import Point
+from spacial.QuadTree import QuadTree
+from config import SIMULATION_WIDTH, SIMULATION_HEIGHT, ENERGY_DENSITY, FOOD_RADIUS
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_REPEATS = 5
+DEFAULT_MIN_TIME = 0.2  # seconds per repeat
+DEFAULT_THRESHOLD = 0.10  # flag a regression when ops/sec drops by more than this fraction
+
+BENCHMARKS = {}  # name -> setup function returning (callable, operations per call)
+
+
+def benchmark(name):
+    """ Register a setup function. The setup builds seeded fixtures and returns (fn, ops_per_call) """
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+# --- Brain ---
+
+for _hidden in (0, 8, 32, 128):
+    @benchmark(f"brain.think[hidden={_hidden}]")
+    def _think(hidden=_hidden):
+        brain = fixtures.make_brain(hidden)
+        inputs = fixtures.make_brain_inputs()
+        return (lambda: brain.think(inputs)), 1
+
+
+@benchmark("brain.clone")
+def _brain_clone():
+    brain = fixtures.make_brain(8)
+    random.seed(0)
+    return brain.clone, 1
+
+
+@benchmark("brain.mutate")
+def _brain_mutate():
+    brain = fixtures.make_brain(8)
+    random.seed(0)
+
+    def run():
+        brain.clone().mutate()
+    return run, 1
+
+
+# --- Food QuadTree ---
+
+for _label, _count in (("desert", fixtures.DESERT_FOOD), ("forest", fixtures.FOREST_FOOD)):
+    @benchmark(f"quadtree.get_nearby[{_label}]")
+    def _get_nearby(count=_count):
+        tree = fixtures.make_food_field(count)
+        points = fixtures.random_points(256, seed=1)
+
+        def run():
+            for p in points:
+                tree.get_nearby(p, 300)
+        return run, len(points)
+
+    @benchmark(f"quadtree.insert_remove[{_label}]")
+    def _insert_remove(count=_count):
+        tree = fixtures.make_food_field(count)
+        extra = fixtures.make_food_field(256, seed=2).get_all()
+
+        def run():
+            for f in extra:
+                tree.insert(f)
+            for f in extra:
+                tree.remove(f)
+        return run, 2 * len(extra)
+
+
+for _batch in (False, True):
+    @benchmark(f"food.spawn[batch={_batch}]")
+    def _spawn_food(batch=_batch):
+        simulation = fixtures.make_food_spawner()
+        food_energy = ENERGY_DENSITY * FOOD_RADIUS ** 2
+        count = 256
+
+        def run():
+            simulation.food = QuadTree(Point(0, 0), Point(SIMULATION_WIDTH, SIMULATION_HEIGHT), 10, 10)
+            simulation.energy_pool = count * food_energy
+            simulation.food_spawner.spawn_food(batch=batch)
+        return run, count
+
+
+# --- Creature spatial hash grid ---
+
+for _crowd in (75, 500, 2000):
+    @benchmark(f"grid.query_rectangle[crowd={_crowd}]")
+    def _query_rectangle(crowd=_crowd):
+        grid = fixtures.make_grid(fixtures.make_crowd(crowd))
+        points = fixtures.random_points(256, seed=1)
+
+        def run():
+            for p in points:
+                grid.query_rectangle(p.x - 300, p.y - 300, p.x + 300, p.y + 300)
+        return run, len(points)
+
+    @benchmark(f"grid.rebuild[crowd={_crowd}]")
+    def _rebuild(crowd=_crowd):
+        creatures = fixtures.make_crowd(crowd)
+        grid = fixtures.make_grid(creatures)
+
+        def run():
+            grid.clear_frame()
+            for c in creatures:
+                grid.insert(c, c.pos.x, c.pos.y)
+        return run, len(creatures)
+
+
+# --- Creature sensing ---
+
+for _label, _count in (("desert", fixtures.DESERT_FOOD), ("forest", fixtures.FOREST_FOOD)):
+    @benchmark(f"creature.find_food[{_label}]")
+    def _find_food(count=_count):
+        tree = fixtures.make_food_field(count)
+        creature = fixtures.make_creature()
+        nearby = tree.get_nearby(creature.pos, creature.genome.viewable_distance)
+        return (lambda: creature.find_food(nearby)), 1
+
+for _crowd in (75, 500, 2000):
+    @benchmark(f"creature.find_creature[crowd={_crowd}]")
+    def _find_creature(crowd=_crowd):
+        # crowd packed into one screen-sized area so sensing sees a realistic number of neighbours
+        creatures = fixtures.make_crowd(crowd, width=SIMULATION_WIDTH / 4, height=SIMULATION_HEIGHT / 4)
+        grid = fixtures.make_grid(creatures)
+        creature = creatures[0]
+        r = creature.genome.viewable_distance
+        nearby = grid.query_rectangle(creature.pos.x - r, creature.pos.y - r, creature.pos.x + r, creature.pos.y + r)
+        return (lambda: creature.find_creature(nearby)), 1
+
+
+@benchmark("creature.energy_loss[crowd=500]")
+def _energy_loss():
+    creatures = fixtures.make_crowd(500)
+
+    def run():
+        for c in creatures:
+            c.calculate_energy_loss()
+    return run, len(creatures)
+
+
+# --- Births ---
+
+for _fast in (False, True):
+    @benchmark(f"creature.reproduce[fast={_fast}]")
+    def _reproduce(fast=_fast):
+        parent = fixtures.make_creature()
+        parent.brain = fixtures.make_brain(8)
+        parent.refresh_derived()
+        random.seed(0)
+
+        def run():
+            parent.energy = parent.genome.init_energy
+            parent.reproduce(2, fast=fast)
+        return run, 1
+
+
+# --- Rendering ---
+
+for _crowd in (75, 500):
+    @benchmark(f"render.creatures[crowd={_crowd}]")
+    def _render_creatures(crowd=_crowd):
+        screen, camera = fixtures.make_render_target()
+        creatures = fixtures.make_crowd(crowd, width=fixtures.SCREEN_SIZE[0], height=fixtures.SCREEN_SIZE[1])
+        fixtures.vary_colors(creatures)
+        rng = random.Random(0)
+
+        def run():
+            for c in creatures:
+                c.direction += rng.uniform(-0.1, 0.1)
+                c.draw(screen, camera)
+        return run, len(creatures)
+
+
+for _label, _count in (("desert", fixtures.DESERT_FOOD), ("forest", fixtures.FOREST_FOOD)):
+    @benchmark(f"render.food[{_label}]")
+    def _render_food(count=_count):
+        # the whole world in view, as when zoomed out
+        screen, camera = fixtures.make_render_target(zoom=fixtures.SCREEN_SIZE[0] / SIMULATION_WIDTH)
+        food = fixtures.make_food_field(count).get_all()
+        renderer = FoodRenderer()
+        return (lambda: renderer.draw(screen, camera, food)), len(food)
+
+
+# --- Genome ---
+
+@benchmark("genome.mutate")
+def _genome_mutate():
+    genome = fixtures.make_creature().genome
+    random.seed(0)
+    return genome.mutate, 1
+
+
+@benchmark("genome.clone")
+def _genome_clone():
+    genome = fixtures.make_creature().genome
+    return genome.clone, 1
+
+
+@benchmark("genome.mutate_batch[children=64]")
+def _genome_mutate_batch():
+    genomes = [fixtures.make_creature().genome.clone() for _ in range(64)]
+    rng = np.random.default_rng(0)
+    return (lambda: Genome.mutate_batch(genomes, rng)), len(genomes)
+
+
+@benchmark("genome.matrix[population=500]")
+def _genome_matrix():
+    genomes = [c.genome for c in fixtures.make_crowd(500)]
+    return (lambda: Genome.matrix(genomes)), len(genomes)
+
+
+# --- Entity attributes ---
+
+@benchmark("entity.attributes[creature]")
+def _creature_attributes():
+    creatures = fixtures.make_crowd(500)
+
+    def run():
+        total = 0.0
+        for c in creatures:
+            total += c.pos.x + c.pos.y + c.direction + c.energy + c.speed + c.genome.radius + c.genome.viewable_distance
+        return total
+    return run, len(creatures)
+
+
+@benchmark("entity.attributes[food]")
+def _food_attributes():
+    food = fixtures.make_food_field(fixtures.FOREST_FOOD).get_all()
+
+    def run():
+        total = 0.0
+        for f in food:
+            total += f.pos.x + f.pos.y + f.radius + f.energy
+        return total
+    return run, len(food)
+
+
+# --- runner ---
+
+def time_benchmark(fn, ops_per_call, repeats=DEFAULT_REPEATS, min_time=DEFAULT_MIN_TIME):
+    """ Returns a list of ops/sec measurements, one per repeat """
+    # calibrate the number of calls so one repeat takes at least min_time
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 4:
+            break
+        loops *= 4
+    loops = max(1, int(loops * min_time / max(elapsed, 1e-9)))
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        samples.append(loops * ops_per_call / elapsed)
+    return samples
+
+
+def run_benchmarks(names, repeats=DEFAULT_REPEATS, min_time=DEFAULT_MIN_TIME):
+    results = {}
+    for name in names:
+        fn, ops_per_call = BENCHMARKS[name]()
+        samples = time_benchmark(fn, ops_per_call, repeats, min_time)
+        mean = statistics.mean(samples)
+        stdev = statistics.stdev(samples) if len(samples) > 1 else 0.0
+        results[name] = {
+            "ops_per_sec": mean,
+            "stdev": stdev,
+            "rel_stdev": stdev / mean if mean else 0.0,
+            "samples": samples,
+        }
+        print(f"{name:<40} {mean:>14,.1f} ops/s  ±{results[name]['rel_stdev']:6.1%}")
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """ Print current vs baseline and return the names of benchmarks that regressed beyond threshold """
+    regressions = []
+    print()
+    print(f"{'benchmark':<40} {'baseline':>14} {'current':>14} {'change':>8}")
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["ops_per_sec"]
+        after = current["ops_per_sec"]
+        change = after / before - 1
+        flag = ""
+        if change < -threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change > threshold:
+            flag = "  faster"
+        print(f"{name:<40} {before:>14,.1f} {after:>14,.1f} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for simulation hot paths")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME, help="seconds per repeat")
+    parser.add_argument("--output", help="results json path (default: benchmarks/results/micro_<time>.json)")
+    parser.add_argument("--baseline", help="results json to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="fractional slowdown treated as a regression")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    fixtures.init_headless_pygame()
+    results = run_benchmarks(names, args.repeats, args.min_time)
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("micro_%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "meta": {
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "repeats": args.repeats,
+                "min_time": args.min_time,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+End-to-end scaling benchmark: runs Simulation.update headless at increasing population sizes.
+
+World area and food count scale with the population so density matches the default 75 creature desert/forest world.
+Each size runs in its own process so peak RSS is measured per size. Runs are fully seeded.
+
+Run from the repository root:
+    python -m benchmarks.scaling_benchmark
+    python -m benchmarks.scaling_benchmark --sizes 75 500 --ticks 200
+"""
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from benchmarks import fixtures
+from config import NUM_INIT_CREATURE, NUM_INIT_FOOD, SIMULATION_WIDTH, SIMULATION_HEIGHT, SEED, PHASE_TIMER_CAPACITY
+from telemetry.PhaseTimer import PHASES, PhaseTimer
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_SIZES = [75, 500, 2000, 10000]
+DEFAULT_TICKS = 300
+DEFAULT_WARMUP = 30
+FIXED_DT = 1.0 / 60.0
+
+
+def world_for(num_creatures):
+    """ World size and food count with the same densities as the configured default world """
+    scale = num_creatures / NUM_INIT_CREATURE
+    side_scale = math.sqrt(scale)
+    return {
+        "num_creatures": num_creatures,
+        "num_food": round(NUM_INIT_FOOD * scale),
+        "width": SIMULATION_WIDTH * side_scale,
+        "height": SIMULATION_HEIGHT * side_scale,
+    }
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(num_creatures, ticks=DEFAULT_TICKS, warmup=DEFAULT_WARMUP, seed=SEED):
+    """ Run one population size in this process and return its measurements """
+    from telemetry.NullDatastore import NullDatastore
+    from world.Simulation import Simulation
+
+    fixtures.init_headless_pygame()
+    world = world_for(num_creatures)
+
+    random.seed(seed)
+    simulation = Simulation(world["width"], world["height"], NullDatastore(), world["num_creatures"], world["num_food"])
+    simulation.stop_at_hour = False
+    simulation.initialize()
+
+    for _ in range(warmup):
+        simulation.update(FIXED_DT)
+
+    timer = PhaseTimer(capacity=max(ticks, PHASE_TIMER_CAPACITY), enabled=True)
+    simulation.phase_timer = timer
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        simulation.update(FIXED_DT)
+    elapsed = time.perf_counter() - start
+
+    return {
+        **world,
+        "seed": seed,
+        "ticks": ticks,
+        "seconds": elapsed,
+        "ticks_per_sec": ticks / elapsed,
+        "ms_per_tick": 1000 * elapsed / ticks,
+        "mean_population": timer.mean_population(),
+        "final_population": len(simulation.creatures),
+        "phases_ms": {name: 1000 * seconds for name, seconds in timer.mean_durations().items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def scaling_exponent(results):
+    """ Slope of log(time per tick) against log(mean population): 1 is linear, 2 is quadratic """
+    if len(results) < 2:
+        return None
+    x = np.log([r["mean_population"] for r in results])
+    y = np.log([r["ms_per_tick"] for r in results])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def print_report(results):
+    print(f"{'creatures':>10} {'food':>8} {'ticks/s':>10} {'ms/tick':>10} {'peak MB':>9}")
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-"
+        print(f"{r['num_creatures']:>10} {r['num_food']:>8} {r['ticks_per_sec']:>10.2f} {r['ms_per_tick']:>10.2f} {rss:>9}")
+
+    print("\nPer-phase ms/tick")
+    print(f"{'phase':<16}" + "".join(f"{r['num_creatures']:>10}" for r in results))
+    for phase in PHASES:
+        print(f"{phase:<16}" + "".join(f"{r['phases_ms'][phase]:>10.2f}" for r in results))
+
+    print()
+    for prev, cur in zip(results, results[1:]):
+        local = math.log(cur["ms_per_tick"] / prev["ms_per_tick"]) / math.log(cur["mean_population"] / prev["mean_population"])
+        print(f"Scaling exponent {prev['num_creatures']} -> {cur['num_creatures']}: {local:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless end-to-end scaling benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="initial creature counts")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="measured ticks per size")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="results json path (default: benchmarks/results/scaling_<time>.json)")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)  # run one size and print json
+    args = parser.parse_args(argv)
+
+    if args.single:
+        print(json.dumps(run_size(args.sizes[0], args.ticks, args.warmup, args.seed)))
+        return 0
+
+    results = []
+    for size in args.sizes:
+        print(f"Running {size} creatures...", flush=True)
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.scaling_benchmark", "--single",
+             "--sizes", str(size), "--ticks", str(args.ticks), "--warmup", str(args.warmup), "--seed", str(args.seed)],
+            check=True, stdout=subprocess.PIPE, text=True,
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print()
+    print_report(results)
+    exponent = scaling_exponent(results)
+    if exponent is not None:
+        print(f"Overall scaling exponent: {exponent:.2f}")
+
+    output = args.output or os.path.join(RESULTS_DIR, time.strftime("scaling_%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"seed": args.seed, "scaling_exponent": exponent, "results": results}, f, indent=2)
+    print(f"Saved results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
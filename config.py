@@ -20,6 +20,7 @@ TITLE = f"F{IS_FOREST}_D{DAMAGE_SCALAR}_L{IS_LIMITED}___400__"  # use this to na
 # ---------- Simulation ---------- 
 SIMULATION_WIDTH = 12000
 SIMULATION_HEIGHT = 8000
+CONTROL_INTERVAL = 1  # creatures sense and think every this many ticks, staggered by id (1 = every tick; others change results)
 NUM_INIT_CREATURE = 75
 
 # ---------- Food ----------
@@ -38,12 +39,16 @@ FOREST_SPAWN_WEIGHT_MIN = 5 # relative min weight for forest spawn
 FOREST_SPAWN_WEIGHT_MAX = 10  # relative max weight for forest spawn
 FOREST_MIN_SIZE = 0.25 # 0-1 indicating % of world
 FOREST_MAX_SIZE = 0.4 # 0-1 indicating % of world
+BATCH_FOOD_SPAWNING = False  # place each tick's food in one NumPy batch with bulk QuadTree inserts (changes seeded results)
 
 # ---------- Genetics ----------
 # Also see the Genome.py file for specific gene details
 DEFAULT_MUTATION_RATE = 0.2 # chance of mutation
 DEFAULT_MUTATION_STRENGTH = 0.1 # max % change due to mutation
 
+FAST_BIRTHS = False  # births copy the parent's brain without first building a throwaway random one (changes seeded results)
+BATCH_GENOME_MUTATION = False  # mutate all of a tick's newborn genomes in one NumPy call (changes seeded results)
+
 # ---------- Energy ----------
 DEFAULT_MAX_ENERGY = 60
 BASAL_METABOLIC_RATE_ENERGY_PENALTY = 0.6
@@ -75,4 +80,36 @@ REMOVE_NODE_MUTATION_RATE = 0.1
 REMOVE_EDGE_MUTATION_RATE = 0.33
 
 WEIGHT_MUTATION_MEAN = 0
-WEIGHT_MUTATION_SD = 0.25
\ No newline at end of file
+WEIGHT_MUTATION_SD = 0.25
+
+# ---------- Rendering ----------
+SPRITE_CACHE_BYTES = 64 * 1024 * 1024  # tinted and rotated creature sprites kept in the LRU sprite cache
+SPRITE_TINT_CACHE_BYTES = 16 * 1024 * 1024  # tinted, unscaled sprite frames (one per creature colour and frame)
+SPRITE_ANGLE_STEPS = 72  # rotations cached per sprite (5 degrees apart)
+SPRITE_ZOOM_STEP = 1.05  # cached sprites are zoomed to the nearest power of this
+SNAPSHOT_MAX_CREATURES = 5000  # creatures published per shared memory snapshot (viewer.py)
+SNAPSHOT_MAX_FOOD = 20000  # food items published per shared memory snapshot (viewer.py)
+SNAPSHOT_PUBLISH_INTERVAL = 1 / 120  # wall seconds between snapshots published by the simulation process
+LOD_SPRITE_ZOOM = 0.3  # creatures are drawn as sprites at or above this camera zoom
+LOD_HEATMAP_ZOOM = 0.1  # coloured circles down to this zoom, a food/creature density heatmap below it
+RENDER_CULL_MARGIN = 150  # pixels; covers how far creatures can move or be pushed since the creature grid was built
+
+FRAME_BUDGET_FPS = 60  # uncapped mode fills each frame of this rate with as many ticks as fit
+MAX_TICKS_PER_FRAME = 1000  # upper bound on ticks run between two renders
+THROUGHPUT_REFRESH_SECONDS = 2  # in throughput mode ('r') the screen is only redrawn this often
+
+LEADERBOARD_REFRESH_INTERVAL = 0.1  # simulation seconds between re-ranking the creatures shown in the menu
+
+# ---------- Telemetry ----------
+POPULATION_STATS_INTERVAL = 5  # seconds of simulation time between population gene stat samples
+PHASE_TIMING = False  # record per-phase tick timings (toggle live with 't')
+PHASE_TIMER_CAPACITY = 600  # number of recent ticks kept in the phase timing ring buffer
+PHASE_TRACE = False  # also export the buffered ticks as a Chrome/Perfetto trace on exit
+DIGEST_INTERVAL = 60  # ticks between state digests when recording a determinism trace
+PROFILE_TICKS = 300  # ticks profiled per capture (press 'p' while running)
+PROFILE_DIR = "profiles"  # where profile captures are written
+MEMORY_REPORT = False  # sample a memory breakdown by subsystem (uses tracemalloc, which slows the simulation)
+MEMORY_REPORT_INTERVAL = 5  # simulation minutes between memory reports
+TELEMETRY_PORT = 8765  # localhost port for headless.py --serve
+TELEMETRY_STREAM_INTERVAL = 0.5  # seconds between metrics sent to each /events client
+DEBUG_CHECKS = False  # assert every tick that cached per-creature values (mass, energy costs, vision) match the genome and brain
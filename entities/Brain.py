@@ -15,12 +15,13 @@ from config import (
     REMOVE_NODE_MUTATION_RATE,
     REMOVE_EDGE_MUTATION_RATE,
     WEIGHT_MUTATION_MEAN,
-    WEIGHT_MUTATION_SD
+    WEIGHT_MUTATION_SD,
+    FAST_BIRTHS
 )
 
 
 class Brain:
-    def __init__(self, n_inputs, n_outputs):
+    def __init__(self, n_inputs, n_outputs, init_connections=True):
         self.n_inputs = n_inputs
         self.n_outputs = n_outputs
         self.nodes = list(range(n_inputs + n_outputs))
@@ -28,11 +29,15 @@ class Brain:
         self.topological_order = [i for i in range(n_inputs + n_outputs)]
         self.connections = {}  # (from, to) -> weight
 
-        self.initialize_connections()
+        if init_connections:
+            self.initialize_connections()
 
-    def clone(self):
-        """ Return deep copy of brain """
-        new_brain = Brain(self.n_inputs, self.n_outputs)
+    def clone(self, fast=FAST_BIRTHS):
+        """
+        Return deep copy of brain.
+        Unless fast, the copy first draws random connections that are then overwritten, as seeded runs have always done
+        """
+        new_brain = Brain(self.n_inputs, self.n_outputs, init_connections=not fast)
         new_brain.nodes = list(self.nodes)
         new_brain.topological_order = list(self.topological_order)
         new_brain.connections = dict(self.connections)
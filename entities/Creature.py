@@ -5,24 +5,32 @@ import random
 from entities.Brain import Brain
 from entities.Genome import Genome
 from spacial.Point import Point
+from world.SpriteCache import SpriteCache
 
-from config import IS_LIMITED, NUM_INPUTS, NUM_OUTPUTS, DEFAULT_MAX_ENERGY, BASAL_METABOLIC_RATE_ENERGY_PENALTY, MOVEMENT_ENERGY_PENALTY, SENSORY_ENERGY_PENALTY, NUM_BRAIN_CONNECTION_ENERGY_PENALTY, NUM_BRAIN_NODES_ENERGY_PENALTY
+from config import DEBUG_CHECKS, FAST_BIRTHS, IS_LIMITED, NUM_INPUTS, NUM_OUTPUTS, DEFAULT_MAX_ENERGY, BASAL_METABOLIC_RATE_ENERGY_PENALTY, MOVEMENT_ENERGY_PENALTY, SENSORY_ENERGY_PENALTY, NUM_BRAIN_CONNECTION_ENERGY_PENALTY, NUM_BRAIN_NODES_ENERGY_PENALTY
 
 
 class Creature:
-    _sprites = None
+    __slots__ = (
+        "update_count", "id", "genome", "parent", "generation", "age", "pos", "direction", "energy",
+        "lifetime_energy_spent", "time_since_reproduced", "brain", "turn_rate", "speed", "desire_to_reproduce",
+        "current_sprite",
+        # derived from the genome and brain, see refresh_derived
+        "mass", "max_energy", "sensory_cost", "neural_cost", "view_distance", "view_distance_sq", "fov",
+    )
+    sprite_cache = None  # shared by all creatures, built on the first draw
 
     @classmethod
     def _load_sprites(cls):
-        if cls._sprites is None:
-            cls._sprites = [
+        if cls.sprite_cache is None:
+            frames = [
                 pygame.image.load("Assets/Images/Moving_Frame_1.png").convert_alpha(),
-                pygame.image.load("Assets/Images/Moving_frame_2.png").convert_alpha(),
+                pygame.image.load("Assets/Images/Moving_Frame_2.png").convert_alpha(),
             ]
+            cls.sprite_cache = SpriteCache(frames, palette=[(217, 30, 217), (217, 35, 150)])
 
-    def __init__(self, id, pos, genome, parent=None, generation=1):
-        Creature._load_sprites()
-
+    def __init__(self, id, pos, genome, parent=None, generation=1, brain=None, direction=None):
+        """ A random direction and a basic brain are created unless given (births pass the parent's) """
         self.update_count = 0
         self.id = id
         self.genome = genome
@@ -30,37 +38,40 @@ class Creature:
         self.generation = generation
         self.age = 0
         self.pos = pos
-        self.direction = 6.28 * random.random()
+        self.direction = 6.28 * random.random() if direction is None else direction
         self.energy = genome.init_energy
         self.lifetime_energy_spent = 0
         self.time_since_reproduced = 0
-        self.brain = Brain.create_basic_brain(n_inputs=NUM_INPUTS, n_outputs=NUM_OUTPUTS, num_mutations=1)
+        self.brain = Brain.create_basic_brain(n_inputs=NUM_INPUTS, n_outputs=NUM_OUTPUTS, num_mutations=1) if brain is None else brain
 
         self.turn_rate = 0
         self.speed = 0
         self.desire_to_reproduce = 0
 
-        self.sprites = Creature._sprites
         self.current_sprite = 0
 
-        image = self.sprites[0].subsurface(self.sprites[0].get_bounding_rect())
-        width, height = image.get_size()
-        size = max(width, height)
-        square_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-        square_surface.blit(image, ((size - width) // 2, (size - height) // 2))
+        self.refresh_derived()
 
-        self.image_original = square_surface
-        self.image_copy = self.image_original.copy()
-        self.rect = self.image_original.get_rect(center=(self.pos.x, self.pos.y))
+    def refresh_derived(self):
+        """
+        Cache the values that only change when the genome or brain does: mass, max energy (scales with mass), the
+        sensory and neural terms of the energy loss, the view distance and its square, and the FOV half-angle that
+        sensing compares directions against. Called at birth; call again after mutating the genome or brain.
+        """
+        self.mass, self.max_energy, self.sensory_cost, self.neural_cost, self.view_distance, self.view_distance_sq, self.fov = self._derived()
 
-    @property
-    def mass(self):
-        return (self.genome.radius / Genome.gene_metadata["radius"]["default"]) ** 2
+    def _derived(self):
+        genome = self.genome
+        mass = (genome.radius / Genome.gene_metadata["radius"]["default"]) ** 2
+        sensory = SENSORY_ENERGY_PENALTY * (genome.fov / Genome.gene_metadata["fov"]["default"]) * (genome.viewable_distance / Genome.gene_metadata["viewable_distance"]["default"])
+        neural = NUM_BRAIN_NODES_ENERGY_PENALTY * self.num_brain_nodes + NUM_BRAIN_CONNECTION_ENERGY_PENALTY * self.num_brain_connections
+        view_distance = genome.viewable_distance
+        return mass, DEFAULT_MAX_ENERGY * mass, sensory, neural, view_distance, view_distance * view_distance, genome.fov
 
-    @property
-    def max_energy(self):
-        """ Max energy scales with creature mass """
-        return DEFAULT_MAX_ENERGY * self.mass
+    def check_derived(self):
+        """ Debug check that the cached values still match the genome and brain """
+        cached = (self.mass, self.max_energy, self.sensory_cost, self.neural_cost, self.view_distance, self.view_distance_sq, self.fov)
+        assert cached == self._derived(), f"creature {self.id} has stale derived values, refresh_derived was not called after a mutation"
     
     @property
     def num_brain_nodes(self):
@@ -70,23 +81,29 @@ class Creature:
     def num_brain_connections(self):
         return len(self.brain.connections.keys())
 
-    def update(self, dt, nearby_food, nearby_creatures):
-        """Make all updates to self each frame"""
+    def update(self, dt, nearby_food, nearby_creatures, think=True):
+        """
+        Make all updates to self each frame
+        With think=False the creature skips sensing and its brain and keeps moving on its last outputs.
+        """
+        if DEBUG_CHECKS:
+            self.check_derived()
 
-        food_inputs = self.find_food(nearby_food)
-        creature_inputs = self.find_creature(nearby_creatures)
+        if think:
+            food_inputs = self.find_food(nearby_food)
+            creature_inputs = self.find_creature(nearby_creatures)
 
-        # Outputs between [-1, 1]
-        brain_outputs = self.brain.think(
-            [1] +
-            food_inputs +
-            creature_inputs +
-            [self.energy]
-        )
+            # Outputs between [-1, 1]
+            brain_outputs = self.brain.think(
+                [1] +
+                food_inputs +
+                creature_inputs +
+                [self.energy]
+            )
 
-        self.turn_rate = self.genome.max_turn_rate * brain_outputs[0]  # [-max_turn_rate, max_turn_rate]
-        self.speed = ((brain_outputs[1] + 1) / 2) * self.genome.max_speed  # [0, max_speed]
-        self.desire_to_reproduce = brain_outputs[2]  # [-1, 1]
+            self.turn_rate = self.genome.max_turn_rate * brain_outputs[0]  # [-max_turn_rate, max_turn_rate]
+            self.speed = ((brain_outputs[1] + 1) / 2) * self.genome.max_speed  # [0, max_speed]
+            self.desire_to_reproduce = brain_outputs[2]  # [-1, 1]
 
         if self.age > 2 or self.parent is None:
             # Rotate direction
@@ -120,7 +137,8 @@ class Creature:
         """ Returns the normalized distance(0 to 1) and direction to the single closest food item, if one is in vision,
             and returns the total count of food items in vision."""
         # defaults if none visible
-        dist_to_closest = self.genome.viewable_distance
+        dist_to_closest = self.view_distance
+        fov = self.fov
         dir_to_closest = 0
         count_in_vision = 0
         total_energy = 0
@@ -132,7 +150,7 @@ class Creature:
             dist = self.distance_to_food(food_piece)
             dir = self.direction_to_food(food_piece)
 
-            if abs(dir) <= self.genome.fov:
+            if abs(dir) <= fov:
                 energy = food_piece.energy
                 count_in_vision += 1
                 total_energy += energy
@@ -145,7 +163,7 @@ class Creature:
             avg_energy = total_energy / count_in_vision
 
         # normalize
-        dist_to_closest /= self.genome.viewable_distance
+        dist_to_closest /= self.view_distance
 
         if IS_LIMITED:
             return [dist_to_closest, dir_to_closest, count_in_vision]
@@ -164,7 +182,8 @@ class Creature:
         return normalised_delta
 
     def find_creature(self, nearby_creatures):
-        dist_sq = self.genome.viewable_distance * self.genome.viewable_distance
+        dist_sq = self.view_distance_sq
+        fov = self.fov
         dist_to_closest = dist_sq
         dir_to_closest = 0
         count_in_vision = 0
@@ -187,7 +206,7 @@ class Creature:
 
             dir = self.direction_to_creature(diff_x, diff_y)
 
-            if abs(dir) <= self.genome.fov:
+            if abs(dir) <= fov:
                 count_in_vision += 1
                 avg_speed += creature_object.speed
                 avg_radius += creature_object.genome.radius
@@ -242,21 +261,34 @@ class Creature:
 
         return True
     
-    def reproduce(self, child_id):
-        """ Returns a child creature """
+    def reproduce(self, child_id, fast=FAST_BIRTHS, mutate_genome=True):
+        """
+        Returns a child creature.
+        The fast path hands the child copies of the parent's brain and direction directly. The default path first
+        gives the child a random direction and basic brain and then overwrites them, which keeps seeded runs
+        identical to earlier versions.
+        With mutate_genome=False the child's genome is an unmutated copy, for callers that mutate in a batch.
+        """
         # Reset time since reproduced
         self.time_since_reproduced = 0
 
         # Get child creature
         child_pos = Point(self.pos.x, self.pos.y)
-        child = Creature(child_id, child_pos, self.genome.clone(), self.id, self.generation + 1)
-        child.speed = self.speed
-        child.direction = self.direction
-        child.brain = self.brain.clone()
+        if fast:
+            child = Creature(child_id, child_pos, self.genome.clone(), self.id, self.generation + 1,
+                             brain=self.brain.clone(fast=True), direction=self.direction)
+            child.speed = self.speed
+        else:
+            child = Creature(child_id, child_pos, self.genome.clone(), self.id, self.generation + 1)
+            child.speed = self.speed
+            child.direction = self.direction
+            child.brain = self.brain.clone(fast=False)
 
         # Apply mutations
         child.brain.mutate()
-        child.genome.mutate()
+        if mutate_genome:
+            child.genome.mutate()
+        child.refresh_derived()
 
         # Adjust energy
         energy_for_child = self.energy * self.genome.percent_energy_for_child
@@ -276,79 +308,33 @@ class Creature:
 
         movement = MOVEMENT_ENERGY_PENALTY * mass * (self.speed / self.genome.max_speed) ** 2
 
-        sensory = SENSORY_ENERGY_PENALTY * (self.genome.fov / Genome.gene_metadata["fov"]["default"]) * (self.genome.viewable_distance / Genome.gene_metadata["viewable_distance"]["default"])
-
-        neural = NUM_BRAIN_NODES_ENERGY_PENALTY * self.num_brain_nodes + NUM_BRAIN_CONNECTION_ENERGY_PENALTY * self.num_brain_connections
-
-        return basal + movement + sensory + neural
+        return basal + movement + self.sensory_cost + self.neural_cost
     
     def change_sprite_frame(self):
         """
-        Changes the sprite frame 
+        Alternates between the animation frames every 7 draws
         """
 
         if self.update_count == 7:
-
             self.update_count = 0
-
-            if self.current_sprite == 0:
-                self.current_sprite = 1
-
-            else:
-                self.current_sprite = 0
-
-            # Original Image
-
-            image = self.sprites[self.current_sprite].subsurface(self.sprites[self.current_sprite].get_bounding_rect())
-            width, height = image.get_size()
-            size = max(width, height)
-            square_surface = pygame.Surface((size, size), pygame.SRCALPHA)
-            square_surface.blit(image, ((size- width) //2, (size - height) //2))
-
-            # Maintain original image
-
-            self.image_original = square_surface
-        
-            # Make a copy of the image for modification
-
-            self.image_copy = self.image_original.copy()
+            self.current_sprite = 1 - self.current_sprite
 
         self.update_count = self.update_count + 1
 
-
     def draw(self, screen, camera):
 
+        Creature._load_sprites()  # loaded on first draw, so creatures can be built without a display
         self.change_sprite_frame()
 
         screen_pos = camera.world_to_screen((self.pos.x, self.pos.y))
 
-        scaled_radius = self.genome.radius * camera.zoom
-
-        # Change the Image Color
-
         color = (int(self.genome.color_r), int(self.genome.color_g), int(self.genome.color_b))
-
-        pixel_array = pygame.PixelArray(self.image_copy)
-
-        pixel_array.replace((217, 30, 217), color)
-
-        pixel_array.replace((217, 35, 150), color)
-
-        del pixel_array
-
-        # Scale the image
-
         diameter = int(self.genome.radius * 2)
+        angle = -math.degrees(self.direction) + 90 + 180
 
-        image_scaled =  pygame.transform.smoothscale(self.image_copy, (diameter, diameter))
-
-        # Rotate and Zoom the image
-
-        image_rotated_zoom = pygame.transform.rotozoom(image_scaled, -math.degrees(self.direction) + 90 + 180, camera.zoom)
-
-        scaled_rect = image_rotated_zoom.get_rect(center=screen_pos)
+        image = Creature.sprite_cache.get(color, self.current_sprite, diameter, angle, camera.zoom)
 
-        screen.blit(image_rotated_zoom, scaled_rect)
+        screen.blit(image, image.get_rect(center=screen_pos))
 
     def getEnergy(self):
         return self.energy
@@ -2,6 +2,7 @@ import pygame
 from config import ENERGY_DENSITY
 
 class Food:
+    __slots__ = ("pos", "radius", "color", "energy", "image")
     _sprite = None
 
     @classmethod
@@ -21,5 +22,5 @@ class Food:
 
     def draw(self, screen, camera):
         screen_pos = camera.world_to_screen((self.pos.x, self.pos.y))
-        self.image_scaled = pygame.transform.scale_by(self.image, camera.zoom)
-        screen.blit(self.image_scaled, (screen_pos[0], screen_pos[1]))
\ No newline at end of file
+        image_scaled = pygame.transform.scale_by(self.image, camera.zoom)
+        screen.blit(image_scaled, (screen_pos[0], screen_pos[1]))
\ No newline at end of file
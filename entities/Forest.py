@@ -1,4 +1,6 @@
 class Forest:
+    __slots__ = ("position", "weight", "radius_x", "radius_y", "color")
+
     def __init__(self, position, weight, radius_x, radius_y):
         self.position = position
         self.weight = weight
@@ -1,17 +1,34 @@
 import random
+from array import array
+
+import numpy as np
+
 from config import DEFAULT_MUTATION_RATE, DEFAULT_MUTATION_STRENGTH
 
 
 class Genome:
+    """
+    Gene values are a fixed-order vector of floats (array('d')) in gene_metadata order, so clone is an array copy.
+    Each registered gene is also an attribute (genome.radius) reading and writing its entry in the vector.
+    The class keeps the metadata as numpy arrays in the same order for batch mutation and the population matrix.
+    """
+    __slots__ = ("values",)
 
     # Stores metadata for each gene
     # {gene_name: {default, min, max, mutation_rate, mutation_strength}}
     gene_metadata = {}
 
+    # The same metadata as arrays in gene order, rebuilt by register_gene
+    gene_names = ()
+    gene_min = np.empty(0)
+    gene_max = np.empty(0)
+    gene_rate = np.empty(0)
+    gene_strength = np.empty(0)
+    _mutation_params = ()  # (min, max, rate, strength) per gene, with the registered Python numbers
+
     def __init__(self, **gene_values):
-        """ Not directly called. Instead used by create_default """
-        for gene, value in gene_values.items():
-            setattr(self, gene, value)
+        """ Not directly called. Instead used by create_default. Genes not given take their default """
+        self.values = array("d", [gene_values.get(name, metadata["default"]) for name, metadata in self.gene_metadata.items()])
 
     @classmethod
     def create_default(cls):
@@ -21,7 +38,7 @@ class Genome:
 
     @classmethod
     def register_gene(cls, name, default, min, max, mutation_rate=DEFAULT_MUTATION_RATE, mutation_strength=DEFAULT_MUTATION_STRENGTH):
-        """ Class method. Adds gene to genome metadata """
+        """ Class method. Adds gene to genome metadata and an attribute for it """
         cls.gene_metadata[name] = {
             "default": default,
             "min": min,
@@ -29,26 +46,69 @@ class Genome:
             "mutation_rate": mutation_rate,
             "mutation_strength": mutation_strength
         }
+        setattr(cls, name, _gene_property(len(cls.gene_metadata) - 1))
+
+        metadata = cls.gene_metadata.values()
+        cls.gene_names = tuple(cls.gene_metadata)
+        cls.gene_min = np.array([m["min"] for m in metadata], dtype=np.float64)
+        cls.gene_max = np.array([m["max"] for m in metadata], dtype=np.float64)
+        cls.gene_rate = np.array([m["mutation_rate"] for m in metadata], dtype=np.float64)
+        cls.gene_strength = np.array([m["mutation_strength"] for m in metadata], dtype=np.float64)
+        cls._mutation_params = tuple((m["min"], m["max"], m["mutation_rate"], m["mutation_strength"]) for m in metadata)
 
     def clone(self):
         """ Return genome with identical values as current """
-        values = {name: getattr(self, name) for name in self.gene_metadata}
-        return Genome(**values)
-    
+        child = Genome.__new__(Genome)
+        child.values = self.values[:]
+        return child
+
     def mutate(self):
         """
         Randomly mutate the values of each gene
         Mutations are Normal with standard deviation = range * mutation_strength.
         Values are clamped to [min, max] after mutation.
         """
-        for name, metadata in self.gene_metadata.items():
-            if random.random() < metadata["mutation_rate"]:
-                current = getattr(self, name)
-                gene_range = metadata["max"] - metadata["min"]
-                delta = random.gauss(0, gene_range * metadata["mutation_strength"])
-                new_value = current + delta
-                new_value = max(metadata["min"], min(metadata["max"], new_value))
-                setattr(self, name, new_value)
+        values = self.values
+        for i, (low, high, rate, strength) in enumerate(self._mutation_params):
+            if random.random() < rate:
+                new_value = values[i] + random.gauss(0, (high - low) * strength)
+                values[i] = max(low, min(high, new_value))
+
+    @classmethod
+    def mutate_batch(cls, genomes, rng=None):
+        """
+        Mutate many genomes with one set of NumPy calls: a mask of genes drawn with probability mutation_rate gets
+        Normal noise with standard deviation = range * mutation_strength, then is clipped to [min, max].
+        Same distribution as mutate but a different random stream. rng defaults to a generator seeded from random,
+        so seeded runs stay reproducible.
+        """
+        genomes = list(genomes)
+        if not genomes:
+            return
+        if rng is None:
+            rng = np.random.default_rng(random.getrandbits(64))
+        matrix = cls.matrix(genomes)
+        mutated = rng.random(matrix.shape) < cls.gene_rate
+        noise = rng.standard_normal(matrix.shape) * ((cls.gene_max - cls.gene_min) * cls.gene_strength)
+        matrix = np.where(mutated, np.clip(matrix + noise, cls.gene_min, cls.gene_max), matrix)
+        for genome, row in zip(genomes, matrix):
+            memoryview(genome.values)[:] = memoryview(row)
+
+    @classmethod
+    def matrix(cls, genomes):
+        """ (len(genomes), len(gene_names)) float64 array of gene values, one row per genome and columns in gene_names order """
+        genomes = list(genomes)
+        return np.frombuffer(b"".join(g.values for g in genomes), dtype=np.float64).reshape(len(genomes), len(cls.gene_names)).copy()
+
+
+def _gene_property(index):
+    def get(genome):
+        return genome.values[index]
+
+    def set(genome, value):
+        genome.values[index] = value
+    return property(get, set)
+
 
 Genome.register_gene(name="max_speed", default=150, min=1, max=500) # pixels per second
 Genome.register_gene(name="max_turn_rate", default=3.14, min=1, max=6.28) # radians per second
@@ -61,4 +121,4 @@ Genome.register_gene(name="fov", default=1.57, min=1, max=6.28) # radians
 Genome.register_gene(name="init_energy", default=30, min=30, max=30) # seconds of survival
 Genome.register_gene(name="color_r", default=255, min=75, max=255, mutation_rate=0.05, mutation_strength=0.1) # red component of color
 Genome.register_gene(name="color_g", default=255, min=0, max=80, mutation_rate=0.05, mutation_strength=0.1) # green component of color
-Genome.register_gene(name="color_b", default=255, min=75, max=255, mutation_rate=0.05, mutation_strength=0.1) # blue component of color
\ No newline at end of file
+Genome.register_gene(name="color_b", default=255, min=75, max=255, mutation_rate=0.05, mutation_strength=0.1) # blue component of color
@@ -0,0 +1,119 @@
+"""
+Runs the simulation without a window, as fast as possible.
+
+    python headless.py [seed] [--minutes 60] [--digest trace.jsonl] [--control-interval 2] [--serve [port]]
+
+Ticks are identical to main.py for the same seed and config, so a headless run can stand in for an interactive one.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame
+
+from world.Simulation import Simulation
+from telemetry.SimulationDatastore import SimulationDatastore
+from telemetry.NullDatastore import NullDatastore
+from telemetry.StateDigest import StateDigest
+from telemetry.ProfileCapture import ProfileCapture
+from telemetry.TelemetryServer import TelemetryServer
+from config import SEED, SIMULATION_HEIGHT, SIMULATION_WIDTH, DIGEST_INTERVAL, PROFILE_TICKS, CONTROL_INTERVAL, TELEMETRY_PORT
+
+FIXED_DT = 1.0 / 60.0  # Same fixed tick as main.py
+PROGRESS_INTERVAL = 60  # sim seconds between progress lines
+PAUSE_POLL_SECONDS = 0.005  # how often a paused run checks for commands
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the simulation headless")
+    parser.add_argument("seed", nargs="?", type=int, default=SEED)
+    parser.add_argument("--minutes", type=float, default=60, help="simulated minutes to run")
+    parser.add_argument("--ticks", type=int, default=None, help="number of ticks to run (overrides --minutes)")
+    parser.add_argument("--no-telemetry", action="store_true", help="don't record or save the datastore")
+    parser.add_argument("--digest", help="write a determinism trace (json lines) to this path")
+    parser.add_argument("--digest-interval", type=int, default=DIGEST_INTERVAL, help="ticks between state digests")
+    parser.add_argument("--digest-values", action="store_true", help="store raw values in the trace for tolerance comparisons")
+    parser.add_argument("--profile-at", type=float, action="append", default=[], metavar="SECONDS",
+                        help="profile the ticks starting at this sim time (repeatable)")
+    parser.add_argument("--profile-ticks", type=int, default=PROFILE_TICKS, help="ticks profiled per capture")
+    parser.add_argument("--control-interval", type=int, default=CONTROL_INTERVAL, metavar="K",
+                        help="creatures sense and think every K ticks, staggered into K groups (1 = every tick)")
+    parser.add_argument("--serve", type=int, nargs="?", const=TELEMETRY_PORT, default=None, metavar="PORT",
+                        help=f"serve live metrics and pause/step/checkpoint controls on localhost (default port {TELEMETRY_PORT})")
+    parser.add_argument("--quiet", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    seed = args.seed
+    print(f"Simulating with seed = {seed}")
+    random.seed(seed)
+
+    # Sprites are converted for the display, so a hidden display is still needed
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    datastore = NullDatastore() if args.no_telemetry else SimulationDatastore()
+    simulation = Simulation(SIMULATION_WIDTH, SIMULATION_HEIGHT, datastore, control_interval=args.control_interval)
+    simulation.initialize()
+
+    digest = None
+    if args.digest:
+        digest = StateDigest(args.digest_interval, args.digest_values, meta={"seed": seed, "control_interval": args.control_interval})
+        digest.capture(simulation, 0)
+
+    profiler = ProfileCapture(seed)
+    profile_times = sorted(args.profile_at)
+
+    ticks = args.ticks if args.ticks is not None else int(round(args.minutes * 60 / FIXED_DT))
+    simulation.stop_at_hour = args.ticks is None and args.minutes <= 60
+
+    server = None
+    if args.serve is not None:
+        simulation.phase_timer.set_enabled(True)  # per-phase timings for /metrics
+        server = TelemetryServer(args.serve)
+        print(f"Serving telemetry on http://{server.host}:{server.start()}")
+
+    start = time.perf_counter()
+    next_progress = PROGRESS_INTERVAL
+    tick = 0
+    try:
+        while tick < ticks:
+            if server is not None and not server.poll(simulation, tick):
+                time.sleep(PAUSE_POLL_SECONDS)
+                continue
+            tick += 1
+            if profile_times and simulation.time >= profile_times[0]:
+                profile_times.pop(0)
+                profiler.request(args.profile_ticks)
+            profiler.step(simulation, FIXED_DT)
+            if server is not None:
+                server.publish(simulation, tick)
+            if digest is not None:
+                digest.maybe_capture(simulation, tick)
+            if not args.quiet and simulation.time >= next_progress:
+                next_progress += PROGRESS_INTERVAL
+                elapsed = time.perf_counter() - start
+                print(f"t={simulation.time:7.1f}s  creatures={len(simulation.creatures):5d}  "
+                      f"{simulation.time / elapsed:6.1f} sim-s/s")
+    finally:
+        if server is not None:
+            server.stop()
+        datastore.close()
+        if digest is not None:
+            digest.finish(simulation, tick)
+            digest.save(args.digest)
+            print(f"Saved determinism trace to {args.digest}")
+        pygame.quit()
+
+    elapsed = time.perf_counter() - start
+    print(f"Ran {ticks} ticks in {elapsed:.1f}s ({ticks / elapsed:.1f} ticks/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
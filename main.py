@@ -1,11 +1,16 @@
 import pygame
+import os
 import sys
 import random
+import time
 from world.Simulation import Simulation
 from world.Menu import Menu
 from world.Camera import Camera
+from world.FrameScheduler import FrameScheduler
+from entities.Creature import Creature
 from telemetry.SimulationDatastore import SimulationDatastore
-from config import SEED, SIMULATION_HEIGHT, SIMULATION_WIDTH
+from telemetry.ProfileCapture import ProfileCapture
+from config import SEED, SIMULATION_HEIGHT, SIMULATION_WIDTH, TITLE, PHASE_TIMING, PHASE_TRACE
 
 SCREEN_WIDTH = 1200
 SCREEN_HEIGHT = 800
@@ -37,6 +42,7 @@ menu = Menu(MENU_WIDTH, MENU_HEIGHT)
 menu.draw(screen)  # Initial draw to set up menu surface
 
 camera = Camera(SIMULATION_WIDTH, SIMULATION_HEIGHT)
+profiler = ProfileCapture(seed)
 
 # Clock for controlling frame rate
 clock = pygame.time.Clock()
@@ -46,16 +52,18 @@ TARGET_FPS = 60
 uncapped_mode = False
 paused = False
 show_menu = True
+show_timings = PHASE_TIMING
 max_steps_per_frame = 100
 
 # Accumulator for normal (real-time) mode
 accumulator = 0.0
 
-# Auto-adjustment for uncapped mode
-steps_per_frame = 1
-frames_since_adjustment = 0
-adjustment_interval = 30
-MIN_FPS = 25
+# 'n' steps through creatures by distance from where the first press was, skipping ones already shown
+browse_origin = None
+browsed_ids = set()
+
+# Fills each uncapped frame with as many ticks as fit, or skips rendering in throughput mode
+scheduler = FrameScheduler()
 
 # Main update loop
 running = True
@@ -71,13 +79,35 @@ while running:
                 paused = not paused
             if event.key == pygame.K_m:
                 show_menu = not show_menu
+            if event.key == pygame.K_t:
+                show_timings = not show_timings
+                simulation.phase_timer.set_enabled(show_timings or PHASE_TIMING)
+            if event.key == pygame.K_p:
+                profiler.request()
             if event.key == pygame.K_c:
                 simulation.stop_at_hour = not simulation.stop_at_hour
+            if event.key == pygame.K_n:
+                # follow the creature nearest the centre of the view, then the next nearest on each press
+                if camera.followed_creature is None or camera.followed_creature.id not in browsed_ids:
+                    browse_origin = (camera.x, camera.y)
+                    browsed_ids = set()
+                nearest = simulation.nearest_creature(browse_origin, exclude=browsed_ids)
+                if nearest is None and browsed_ids:  # every creature has been shown, start over
+                    browsed_ids = set()
+                    nearest = simulation.nearest_creature(browse_origin)
+                if nearest is not None:
+                    browsed_ids.add(nearest.id)
+                    camera.center_creature(nearest)
             if event.key == pygame.K_a:
                 uncapped_mode = not uncapped_mode
-                steps_per_frame = 1
+                if scheduler.throughput_mode:
+                    scheduler.toggle_throughput_mode()
                 accumulator = 0.0  # Reset accumulator when toggling
                 print(f"Uncapped mode: {'ON' if uncapped_mode else 'OFF'}")
+            if event.key == pygame.K_r:
+                uncapped_mode = scheduler.toggle_throughput_mode()
+                accumulator = 0.0
+                print(f"Throughput mode: {'ON' if uncapped_mode else 'OFF'} (refreshing every {scheduler.refresh_seconds}s)")
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left click
                 clicked_button = menu.get_clicked_button(event.pos)
@@ -94,53 +124,56 @@ while running:
                     camera.followed_creature = None
         camera.handle_event(event)
 
-    screen.fill(BLACK)
-
     if paused:
         clock.tick(TARGET_FPS)
 
     else:
-        real_dt = clock.tick(TARGET_FPS) / 1000.0
-
         if uncapped_mode:
-            # Run a fixed number of ticks per frame as fast as possible.
+            # Run as many ticks as fit in the frame budget left after rendering.
             # FIXED_DT is always used — deterministic tick-for-tick given the same seed.
-            for _ in range(steps_per_frame):
-                simulation.update(FIXED_DT)
-
-            # Auto-adjust how many ticks we squeeze per frame based on performance
-            frames_since_adjustment += 1
-            if frames_since_adjustment >= adjustment_interval:
-                frames_since_adjustment = 0
-                actual_fps = clock.get_fps()
-
-                if actual_fps > 50 and steps_per_frame < max_steps_per_frame:
-                    steps_per_frame += 1
-                elif actual_fps < MIN_FPS and steps_per_frame > 1:
-                    steps_per_frame = max(1, steps_per_frame - 1)
+            scheduler.run_ticks(lambda: profiler.step(simulation, FIXED_DT), scheduler.ticks_for_frame())
+            clock.tick()
 
         else:
+            real_dt = clock.tick(TARGET_FPS) / 1000.0
+
             # Normal mode: tick the simulation to keep pace with real time,
             # but always advance by FIXED_DT so behaviour is identical to uncapped mode
             # tick-for-tick. At 60fps real time this runs exactly 1 tick per frame.
             accumulator += real_dt
             steps = 0
             while accumulator >= FIXED_DT and steps < max_steps_per_frame:
-                simulation.update(FIXED_DT)
+                profiler.step(simulation, FIXED_DT)
                 accumulator -= FIXED_DT
                 steps += 1
 
-        if show_menu:
-            menu.update_stats(simulation)
-            menu.show_creature_stats(screen, camera.get_center_creature())
+    scheduler.update_rate(simulation.time)
+    if not paused and not scheduler.should_render():
+        continue
+
+    render_start = time.perf_counter()
+    screen.fill(BLACK)
+    if show_menu and not paused:
+        menu.update_stats(simulation, scheduler.sim_rate)
+        menu.show_creature_stats(screen, camera.get_center_creature())
 
     camera.update()
     simulation.draw(screen, camera)
     if show_menu:
         menu.draw(screen)
+    if show_timings:
+        menu.show_phase_timings(screen, simulation.phase_timer, Creature.sprite_cache, simulation.renderer)
 
     pygame.display.flip()
+    scheduler.record_render(render_start)
 
 pygame.quit()
 datastore.close()
+
+if simulation.phase_timer.count > 0:
+    os.makedirs("data", exist_ok=True)
+    simulation.phase_timer.export_csv("data/phase_timings" + TITLE + str(seed) + ".csv")
+    if PHASE_TRACE:
+        simulation.phase_timer.export_trace("data/phase_trace" + TITLE + str(seed) + ".json")
+
 sys.exit()
\ No newline at end of file
@@ -1,5 +1,6 @@
 class Point:
-    
+    __slots__ = ("x", "y")
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
\ No newline at end of file
@@ -11,6 +11,10 @@ class QuadTree:
         self.contents = []
         self.divided = False
         self.children = [None, None, None, None]
+        self.count = 0  # entities in this node and all its children
+
+    def __len__(self):
+        return self.count
 
     def insert(self, entity):
 
@@ -22,11 +26,13 @@ class QuadTree:
         if self.divided:
             for child in self.children:
                 if child.insert(entity): 
+                    self.count += 1
                     return True # break after placing into one child to prevent duplication
         
         else:
             # if not divided, add to contents
             self.contents.append(entity)
+            self.count += 1
 
             # divide if needed
             if len(self.contents) > self.threshold:
@@ -34,6 +40,42 @@ class QuadTree:
 
             return True
 
+    def insert_many(self, entities):
+        """
+        Insert a batch of entities, splitting them between the children once per node instead of walking the tree
+        once per entity. Returns the number inserted (entities out of bounds are skipped).
+        """
+        inside = [e for e in entities if self.is_in_bounds(e)]
+        if not inside:
+            return 0
+
+        if not self.divided:
+            self.contents.extend(inside)
+            self.count += len(inside)
+            if len(self.contents) > self.threshold:
+                self.divide()
+            return len(inside)
+
+        inserted = self._insert_into_children(inside)
+        self.count += inserted
+        return inserted
+
+    def _insert_into_children(self, entities):
+        """ Bulk insert in-bounds entities into the children, each going to the same child insert would pick """
+        # the first of NW, NE, SE, SW whose (inclusive) bounds hold the entity
+        center = self.children[0].bottom_right
+        nw, ne, se, sw = [], [], [], []
+        for e in entities:
+            if e.pos.y <= center.y:
+                (nw if e.pos.x <= center.x else ne).append(e)
+            else:
+                (se if e.pos.x >= center.x else sw).append(e)
+        inserted = 0
+        for child, batch in zip(self.children, (nw, ne, se, sw)):
+            if batch:
+                inserted += child.insert_many(batch)
+        return inserted
+
     def divide(self):
 
         # don't go past max depth
@@ -54,10 +96,7 @@ class QuadTree:
         ]
 
         # move contents to children
-        for entity in self.contents:
-            for child in self.children:
-                if child.insert(entity):
-                    break
+        self._insert_into_children(self.contents)
 
         # mark as divided
         self.contents = []
@@ -73,6 +112,7 @@ class QuadTree:
         if self.divided:
             for child in self.children:
                 if child.remove(entity): 
+                    self.count -= 1
                     self.try_collapse()
                     return True
             
@@ -80,6 +120,7 @@ class QuadTree:
             # if not divided, remove from contents
             if entity in self.contents:  # check in case of border edge case
                 self.contents.remove(entity)
+                self.count -= 1
                 return True
             return False
             
@@ -144,4 +185,22 @@ class QuadTree:
         # if overlapping with parent, recurse with shared results
         for child in self.children:
             child.get_nearby(pos, radius, radius_sq, results)
-        return results
\ No newline at end of file
+        return results
+
+    def query_rectangle(self, min_x, min_y, max_x, max_y, results=None):
+        """ Returns a list of entities in leaves overlapping the given rectangle """
+
+        if results is None:
+            results = []
+
+        # no overlap, therefore no entities inside
+        if max_x < self.top_left.x or min_x > self.bottom_right.x or max_y < self.top_left.y or min_y > self.bottom_right.y:
+            return results
+
+        if not self.divided:
+            results.extend(self.contents)
+            return results
+
+        for child in self.children:
+            child.query_rectangle(min_x, min_y, max_x, max_y, results)
+        return results
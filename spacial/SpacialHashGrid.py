@@ -45,3 +45,37 @@ class SpatialHashGrid:
             for cx in range(cell_min_x, cell_max_x + 1):
                 out.extend(self.cells.get((cx, cy), ()))
         return out
+
+    def query_point(self, x: float, y: float, tolerance: float):
+        """Accepts a point and returns all creatures in cells within tolerance of it (callers check exact distances)."""
+        return self.query_rectangle(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+
+    def nearest(self, x: float, y: float, max_distance: float = math.inf, predicate=None):
+        """
+        Accepts a point and returns the closest creature (by its current pos) within max_distance, or None.
+        Searches rings of cells outward from the point and stops once no unsearched cell can be closer.
+        predicate(creature) can exclude creatures, e.g. dead ones or the one being followed.
+        """
+        if not self.touched:
+            return None
+        cx, cy = self._cell_coords(x, y)
+        if max_distance == math.inf:
+            max_ring = max(max(abs(kx - cx), abs(ky - cy)) for kx, ky in self.touched)
+        else:
+            max_ring = math.ceil(max_distance * self.inv) + 1
+
+        best = None
+        best_dist_sq = max_distance * max_distance
+        for ring in range(max_ring + 1):
+            # every cell in this ring is at least (ring - 1) cells away from the point
+            if best is not None and best_dist_sq <= ((ring - 1) * self.cell_size) ** 2:
+                break
+            for kx in range(cx - ring, cx + ring + 1):
+                step = 1 if abs(kx - cx) == ring else 2 * ring  # only the ring's edge cells
+                for ky in range(cy - ring, cy + ring + 1, max(step, 1)):
+                    for creature in self.cells.get((kx, ky), ()):
+                        dist_sq = (creature.pos.x - x) ** 2 + (creature.pos.y - y) ** 2
+                        if dist_sq <= best_dist_sq and (predicate is None or predicate(creature)):
+                            best = creature
+                            best_dist_sq = dist_sq
+        return best
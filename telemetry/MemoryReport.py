@@ -0,0 +1,140 @@
+import os
+import sys
+import tracemalloc
+
+from config import MEMORY_REPORT_INTERVAL
+
+SUBSYSTEMS = ["creatures", "brains", "genomes", "food", "spatial", "sprites", "datastore", "other"]
+
+# tracemalloc attributes allocations to the file that made them
+_TRACED_FILES = {
+    "Creature.py": "creatures",
+    "Brain.py": "brains",
+    "Genome.py": "genomes",
+    "Food.py": "food",
+    "FoodSpawner.py": "food",
+    "Point.py": "spatial",
+    "QuadTree.py": "spatial",
+    "SpacialHashGrid.py": "spatial",
+    "SimulationDatastore.py": "datastore",
+}
+
+
+def _shallow(obj):
+    """ Size of an object plus its instance dict, if it has one (slotted entities keep their fields inline) """
+    size = sys.getsizeof(obj)
+    attrs = getattr(obj, "__dict__", None)
+    if attrs is not None:
+        size += sys.getsizeof(attrs)
+    return size
+
+
+def _surface_bytes(surface):
+    if surface is None:
+        return 0
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+class MemoryReport:
+    """
+    Periodic memory breakdown by subsystem.
+    counted_bytes walks the live objects of each subsystem (sys.getsizeof, surface pixel buffers, SQLite pages).
+    traced_bytes comes from a tracemalloc snapshot grouped by the file that allocated the memory; it misses
+    memory allocated outside Python's allocator such as SDL surfaces and SQLite pages, and "other" is only traced.
+    """
+
+    def __init__(self, interval_minutes=MEMORY_REPORT_INTERVAL):
+        self.interval = interval_minutes * 60
+        self._last_sample_time = None
+        self.last_report = None
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def maybe_sample(self, simulation):
+        if self._last_sample_time is not None and simulation.time - self._last_sample_time < self.interval:
+            return False
+        self._last_sample_time = simulation.time
+        report = self.sample(simulation)
+        for subsystem, (counted, traced, objects) in report.items():
+            simulation.datastore.update_memory_report(simulation.time, subsystem, counted, traced, objects)
+        # measured on the writer thread, so the next report sees an up to date database size
+        simulation.datastore.request_database_size()
+        return True
+
+    def sample(self, simulation):
+        """ Returns {subsystem: (counted_bytes, traced_bytes, object_count)} """
+        counted = {name: 0 for name in SUBSYSTEMS}
+        objects = {name: 0 for name in SUBSYSTEMS}
+
+        self._count_creatures(simulation.creatures, counted, objects)
+        self._count_food(simulation.food.get_all(), counted, objects)
+        self._count_spatial(simulation, counted, objects)
+        counted["datastore"] = getattr(simulation.datastore, "database_bytes", 0)
+
+        traced = self._traced()
+
+        self.last_report = {name: (counted[name], traced[name], objects[name]) for name in SUBSYSTEMS}
+        return self.last_report
+
+    def _count_creatures(self, creatures, counted, objects):
+        for c in creatures:
+            counted["creatures"] += _shallow(c) + _shallow(c.pos)
+            objects["creatures"] += 1
+
+            brain = c.brain
+            counted["brains"] += _shallow(brain) + sys.getsizeof(brain.nodes) + sys.getsizeof(brain.topological_order)
+            counted["brains"] += sys.getsizeof(brain.connections)
+            for key, weight in brain.connections.items():
+                counted["brains"] += sys.getsizeof(key) + sys.getsizeof(weight)
+            objects["brains"] += 1
+
+            counted["genomes"] += _shallow(c.genome) + sys.getsizeof(c.genome.values)
+            objects["genomes"] += 1
+
+        sprite_cache = type(creatures[0]).sprite_cache if creatures else None
+        if sprite_cache is not None:
+            for surface in sprite_cache.surfaces():
+                counted["sprites"] += _surface_bytes(surface)
+                objects["sprites"] += 1
+
+    def _count_food(self, food, counted, objects):
+        shared_sprites = set()
+        for f in food:
+            counted["food"] += _shallow(f) + _shallow(f.pos)
+            objects["food"] += 1
+            shared_sprites.add(f.image)
+        for surface in shared_sprites:
+            counted["sprites"] += _surface_bytes(surface)
+            objects["sprites"] += 1
+
+    def _count_spatial(self, simulation, counted, objects):
+        # food QuadTree nodes (the food objects themselves are counted under food)
+        stack = [simulation.food]
+        while stack:
+            node = stack.pop()
+            counted["spatial"] += _shallow(node) + sys.getsizeof(node.contents) + sys.getsizeof(node.children)
+            counted["spatial"] += _shallow(node.top_left) + _shallow(node.bottom_right)
+            objects["spatial"] += 1
+            if node.divided:
+                stack.extend(node.children)
+
+        # creature grid cells
+        grid = simulation.creature_grid
+        counted["spatial"] += _shallow(grid) + sys.getsizeof(grid.cells) + sys.getsizeof(grid.touched)
+        for key, cell in grid.cells.items():
+            counted["spatial"] += sys.getsizeof(key) + sys.getsizeof(cell)
+            objects["spatial"] += 1
+
+    def _traced(self):
+        traced = {name: 0 for name in SUBSYSTEMS}
+        if not tracemalloc.is_tracing():
+            return traced
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics("filename"):
+            filename = stat.traceback[0].filename
+            subsystem = _TRACED_FILES.get(os.path.basename(filename))
+            if subsystem is None and ("sqlite3" in filename or "pandas" in filename):
+                subsystem = "datastore"
+            traced[subsystem or "other"] += stat.size
+        return traced
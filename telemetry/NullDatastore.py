@@ -0,0 +1,40 @@
+import random
+
+
+class NullDatastore:
+    """ Drop-in replacement for SimulationDatastore that records nothing. Used by headless benchmarks """
+
+    def __init__(self):
+        # SimulationDatastore draws a random directory number; draw it too so seeded runs match with or without telemetry
+        self.directory = random.randint(1, 100)
+        self.database_bytes = 0
+
+    def add_new_creature(self, c, time):
+        pass
+
+    def mark_creature_dead(self, creature_id, time):
+        pass
+
+    def update_real_time(self, time, num_creatures, num_food):
+        pass
+
+    def update_collisions(self, time, bigger_creature_id, smaller_creature_id, damage):
+        pass
+
+    def update_population_stats(self, row):
+        pass
+
+    def update_memory_report(self, time, subsystem, counted_bytes, traced_bytes, objects):
+        pass
+
+    def request_database_size(self):
+        pass
+
+    def save(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
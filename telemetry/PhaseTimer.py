@@ -0,0 +1,132 @@
+import csv
+import json
+import time
+import numpy as np
+from config import PHASE_TIMING, PHASE_TIMER_CAPACITY
+
+# Phases of Simulation.update, in execution order.
+# food_query, creature_query, creature_update and contact are interleaved per creature and summed over the tick.
+PHASES = [
+    "grid",
+    "food_query",
+    "creature_query",
+    "creature_update",
+    "contact",
+    "eating",
+    "death",
+    "reproduction",
+    "telemetry",
+    "spawn_food",
+]
+PHASE_INDEX = {name: i for i, name in enumerate(PHASES)}
+
+
+def _no_clock():
+    return 0.0
+
+
+class PhaseTimer:
+    """
+    Per-phase tick timings kept in a rolling ring buffer.
+    When disabled, clock() returns 0 and record_tick() returns immediately, so instrumented code pays almost nothing.
+    """
+
+    def __init__(self, capacity=PHASE_TIMER_CAPACITY, enabled=PHASE_TIMING):
+        self.capacity = capacity
+        self.durations = np.zeros((capacity, len(PHASES)))  # seconds
+        self.candidates = np.zeros((capacity, len(PHASES)), dtype=np.int64)  # entities examined per phase
+        self.population = np.zeros(capacity, dtype=np.int64)
+        self.tick_start = np.zeros(capacity)  # perf_counter at the start of the tick
+        self.sim_time = np.zeros(capacity)
+        self.count = 0  # total ticks recorded, including overwritten ones
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.clock = time.perf_counter if enabled else _no_clock
+
+    def record_tick(self, tick_start, sim_time, population, durations, candidates):
+        """ durations and candidates are sequences in PHASES order """
+        if not self.enabled:
+            return
+        i = self.count % self.capacity
+        self.durations[i] = durations
+        self.candidates[i] = candidates
+        self.population[i] = population
+        self.tick_start[i] = tick_start
+        self.sim_time[i] = sim_time
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def _order(self, last=None):
+        """ Ring buffer rows in chronological order, optionally only the most recent ones """
+        n = min(self.count, self.capacity)
+        if last is not None:
+            n = min(n, last)
+        end = self.count % self.capacity
+        return [(end - n + k) % self.capacity for k in range(n)]
+
+    def mean_durations(self, last=None):
+        """ Mean seconds per tick for each phase over the buffered (or last N) ticks """
+        rows = self._order(last)
+        if not rows:
+            return {name: 0.0 for name in PHASES}
+        means = self.durations[rows].mean(axis=0)
+        return dict(zip(PHASES, means.tolist()))
+
+    def summary(self, last=None):
+        """ List of (phase, mean ms per tick, share of tick, mean candidates per tick) """
+        rows = self._order(last)
+        if not rows:
+            return []
+        means = self.durations[rows].mean(axis=0)
+        total = means.sum() or 1.0
+        cand = self.candidates[rows].mean(axis=0)
+        return [(name, float(means[i] * 1000), float(means[i] / total), float(cand[i])) for i, name in enumerate(PHASES)]
+
+    def mean_population(self, last=None):
+        rows = self._order(last)
+        return float(self.population[rows].mean()) if rows else 0.0
+
+    def export_csv(self, path):
+        """ One row per buffered tick: sim time, population, then <phase>_ms and <phase>_candidates """
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["sim_time", "population"] + [f"{p}_ms" for p in PHASES] + [f"{p}_candidates" for p in PHASES])
+            for i in self._order():
+                writer.writerow(
+                    [self.sim_time[i], int(self.population[i])]
+                    + (self.durations[i] * 1000).tolist()
+                    + self.candidates[i].tolist()
+                )
+
+    def export_trace(self, path):
+        """
+        Write buffered ticks as Chrome trace events (load in chrome://tracing or ui.perfetto.dev).
+        Per-creature phases are interleaved inside a tick, so each phase is drawn as one block with its summed duration.
+        """
+        events = []
+        rows = self._order()
+        origin = self.tick_start[rows[0]] if rows else 0.0
+        for i in rows:
+            ts = (self.tick_start[i] - origin) * 1e6
+            total = self.durations[i].sum() * 1e6
+            events.append({
+                "name": "tick", "ph": "X", "pid": 0, "tid": 0, "ts": ts, "dur": total,
+                "args": {"sim_time": float(self.sim_time[i]), "population": int(self.population[i])},
+            })
+            for j, phase in enumerate(PHASES):
+                dur = self.durations[i, j] * 1e6
+                events.append({
+                    "name": phase, "ph": "X", "pid": 0, "tid": 0, "ts": ts, "dur": dur,
+                    "args": {"candidates": int(self.candidates[i, j])},
+                })
+                ts += dur
+            events.append({
+                "name": "population", "ph": "C", "pid": 0, "ts": (self.tick_start[i] - origin) * 1e6,
+                "args": {"creatures": int(self.population[i])},
+            })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
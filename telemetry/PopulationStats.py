@@ -0,0 +1,89 @@
+from entities.Genome import Genome
+from config import POPULATION_STATS_INTERVAL
+
+BRAIN_STATS = ["num_brain_nodes", "num_brain_connections"]
+
+
+class PopulationStats:
+    """
+    Running sums and sums-of-squares of every gene and brain size over the living population.
+    Updated in O(1) per birth and death, so mean and variance are available at any time without scanning creatures.
+    """
+
+    def __init__(self, sample_interval=POPULATION_STATS_INTERVAL):
+        self.gene_names = list(Genome.gene_metadata)
+        self.names = self.gene_names + BRAIN_STATS
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+        self.count = 0
+        self.sums = [0.0] * len(self.names)
+        self.sums_sq = [0.0] * len(self.names)
+
+        self.sample_interval = sample_interval
+        self._last_sample_time = None
+
+    @staticmethod
+    def stat_names():
+        """ Names of every tracked stat, in column order """
+        return list(Genome.gene_metadata) + BRAIN_STATS
+
+    def _values(self, creature):
+        values = creature.genome.values.tolist()
+        values.append(creature.num_brain_nodes)
+        values.append(creature.num_brain_connections)
+        return values
+
+    def add(self, creature):
+        """ Add a newly born creature to the running sums """
+        sums = self.sums
+        sums_sq = self.sums_sq
+        for i, value in enumerate(self._values(creature)):
+            sums[i] += value
+            sums_sq[i] += value * value
+        self.count += 1
+
+    def remove(self, creature):
+        """ Remove a dead creature from the running sums """
+        sums = self.sums
+        sums_sq = self.sums_sq
+        for i, value in enumerate(self._values(creature)):
+            sums[i] -= value
+            sums_sq[i] -= value * value
+        self.count -= 1
+
+        # An empty population has exactly zero sums, which also clears accumulated rounding error
+        if self.count == 0:
+            self.sums = [0.0] * len(self.names)
+            self.sums_sq = [0.0] * len(self.names)
+
+    def mean(self, name):
+        if self.count == 0:
+            return None
+        return self.sums[self.index[name]] / self.count
+
+    def variance(self, name):
+        """ Population variance of a stat over living creatures """
+        if self.count == 0:
+            return None
+        i = self.index[name]
+        mean = self.sums[i] / self.count
+        return max(0.0, self.sums_sq[i] / self.count - mean * mean)  # clamp rounding error
+
+    def means(self):
+        return {name: self.mean(name) for name in self.names}
+
+    def row(self, time):
+        """ Returns (time, count, mean_0, var_0, mean_1, var_1, ...) in stat_names() order """
+        row = [time, self.count]
+        for name in self.names:
+            row.append(self.mean(name))
+            row.append(self.variance(name))
+        return tuple(row)
+
+    def maybe_sample(self, time, datastore):
+        """ Write a row to the datastore if a sample interval has passed since the last one """
+        if self._last_sample_time is not None and time - self._last_sample_time < self.sample_interval:
+            return False
+        datastore.update_population_stats(self.row(time))
+        self._last_sample_time = time
+        return True
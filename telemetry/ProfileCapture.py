@@ -0,0 +1,131 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from config import PROFILE_TICKS, PROFILE_DIR
+
+SAMPLE_INTERVAL = 0.001  # seconds between stack samples
+SWITCH_INTERVAL = 0.0005  # thread switch interval during a capture so the sampler gets scheduled
+
+
+class ProfileCapture:
+    """
+    Profiles the next N ticks of Simulation.update on demand.
+    Each capture writes a cProfile .pstats file, a .folded file of sampled stacks for flamegraph tools,
+    and a .json file with the sim time, seed and population it was taken at.
+    """
+
+    def __init__(self, seed, output_dir=PROFILE_DIR):
+        self.seed = seed
+        self.output_dir = output_dir
+        self.remaining = 0
+        self.last_output = None
+
+        self._profile = None
+        self._sampler = None
+        self._stacks = Counter()
+        self._in_update = False
+        self._sim_thread_id = None
+        self._stop = threading.Event()
+        self._start_info = None
+        self._ticks = 0
+
+    @property
+    def active(self):
+        return self.remaining > 0
+
+    def request(self, ticks=PROFILE_TICKS):
+        """ Profile the next `ticks` ticks. Ignored while a capture is already running """
+        if not self.active:
+            self.remaining = ticks
+            print(f"Profiling the next {ticks} ticks...")
+
+    def step(self, simulation, dt):
+        """ Run one tick, profiling it if a capture is active """
+        if not self.remaining:
+            simulation.update(dt)
+            return
+
+        if self._profile is None:
+            self._begin(simulation)
+
+        self._in_update = True
+        self._profile.enable()
+        try:
+            simulation.update(dt)
+        finally:
+            self._profile.disable()
+            self._in_update = False
+
+        self._ticks += 1
+        self.remaining -= 1
+        if self.remaining == 0:
+            self._finish(simulation)
+
+    def _begin(self, simulation):
+        self._start_info = {
+            "seed": self.seed,
+            "sim_time": simulation.time,
+            "population": len(simulation.creatures),
+            "wall_clock": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        self._profile = cProfile.Profile()
+        self._stacks = Counter()
+        self._ticks = 0
+        self._sim_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(SWITCH_INTERVAL)
+        self._sampler = threading.Thread(target=self._sample, name="profile-sampler", daemon=True)
+        self._sampler.start()
+        self._wall_start = time.perf_counter()
+
+    def _sample(self):
+        """ Periodically record the simulation thread's Python stack while it is inside update """
+        while not self._stop.wait(SAMPLE_INTERVAL):
+            if not self._in_update:
+                continue
+            frame = sys._current_frames().get(self._sim_thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+
+    def _finish(self, simulation):
+        wall = time.perf_counter() - self._wall_start
+        self._stop.set()
+        self._sampler.join()
+        sys.setswitchinterval(self._switch_interval)
+
+        info = self._start_info
+        info.update({
+            "ticks": self._ticks,
+            "end_sim_time": simulation.time,
+            "end_population": len(simulation.creatures),
+            "wall_seconds": wall,
+            "samples": sum(self._stacks.values()),
+        })
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(
+            self.output_dir,
+            f"profile_seed{info['seed']}_t{info['sim_time']:.0f}s_pop{info['population']}",
+        )
+        self._profile.dump_stats(base + ".pstats")
+        with open(base + ".folded", "w") as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        with open(base + ".json", "w") as f:
+            json.dump(info, f, indent=2)
+
+        self._profile = None
+        self._sampler = None
+        self.last_output = base
+        print(f"Saved profile to {base}.pstats / .folded / .json")
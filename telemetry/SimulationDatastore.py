@@ -1,21 +1,44 @@
 import random
 import sqlite3
+import threading
+import queue
 import pandas as pd
 import os
 from config import SEED, TITLE
+from telemetry.PopulationStats import PopulationStats
 
 AUTOSAVE_INTERVAL = 15 * 60  # save every 15 simulation minutes
+WRITE_QUEUE_SIZE = 10000  # max pending writes before the simulation blocks (backpressure)
+
+_CLOSE = object()  # sentinel telling the writer thread to flush and exit
 
 
 class SimulationDatastore:
+    """
+    Stores simulation telemetry in an in-memory SQLite database.
+    All database work happens on a background writer thread fed by a bounded queue,
+    so the simulation thread only pays for enqueueing a tuple.
+    """
+
     def __init__(self):
-        self.conn = sqlite3.connect(":memory:")
-        self.create_tables()
+        self._queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._error = None
+        self._error_reported = False
+        self._closed = False
         self._last_save_time = 0
+        self.database_bytes = 0  # size of the SQLite database, refreshed by request_database_size()
         self.directory = random.randint(1, 100)
         print("Directory:" + str(self.directory))
         print(TITLE)
 
+        # The connection is created and only ever used by the writer thread
+        self.conn = None
+        self._ready = threading.Event()
+        self._writer = threading.Thread(target=self._run_writer, name="datastore-writer", daemon=True)
+        self._writer.start()
+        self._ready.wait()
+        self._raise_if_failed()
+
     def create_tables(self):
         cursor = self.conn.cursor()
         cursor.execute("""
@@ -50,61 +73,185 @@ class SimulationDatastore:
                 time REAL,
                 bigger_creature INTEGER,
                 smaller_creature INTEGER,
-                damage REAL          
+                damage REAL
+            )
+        """)
+
+        stat_columns = ",\n".join(f"{name}_mean REAL, {name}_var REAL" for name in PopulationStats.stat_names())
+        cursor.execute(f"""
+            CREATE TABLE population_stats (
+                time REAL PRIMARY KEY,
+                num_creatures INTEGER,
+                {stat_columns}
             )
         """)
 
+        cursor.execute("""
+            CREATE TABLE memory_report (
+                time REAL,
+                subsystem TEXT,
+                counted_bytes INTEGER,
+                traced_bytes INTEGER,
+                objects INTEGER
+            )
+        """)
+
+    # --- simulation thread API (enqueue only) ---
+
     def add_new_creature(self, c, time):
+        self._put((self._insert_creature, (
+            c.id,
+            c.parent,
+            c.generation,
+            time,
+            c.genome.max_speed,
+            c.genome.max_turn_rate,
+            c.genome.radius,
+            c.genome.energy_for_reproduction,
+            c.genome.time_between_reproduction,
+            c.genome.percent_energy_for_child,
+            c.genome.viewable_distance,
+            c.genome.fov,
+            c.num_brain_nodes,
+            c.num_brain_connections
+        )))
+
+    def mark_creature_dead(self, creature_id, time):
+        self._put((self._mark_creature_dead, (time, creature_id)))
+
+    def update_real_time(self, time, num_creatures, num_food):
+        self._put((self._insert_real_time, (time, num_creatures, num_food)))
+
+    def update_collisions(self, time, bigger_creature_id, smaller_creature_id, damage):
+        self._put((self._insert_collision, (time, bigger_creature_id, smaller_creature_id, damage)))
+
+    def update_population_stats(self, row):
+        """ row is (time, num_creatures, mean, var, ...) as built by PopulationStats.row """
+        self._put((self._insert_population_stats, (row,)))
+
+    def update_memory_report(self, time, subsystem, counted_bytes, traced_bytes, objects):
+        self._put((self._insert_memory_report, (time, subsystem, counted_bytes, traced_bytes, objects)))
+
+    def request_database_size(self):
+        """ Ask the writer thread to refresh database_bytes """
+        self._put((self._measure_database_size, ()))
+
+    def save(self):
+        """ Request a save of all tables to csv. Runs on the writer thread """
+        self._put((self._save, ()))
+
+    def flush(self):
+        """ Block until every queued write has been applied """
+        self._raise_if_failed()
+        self._queue.join()
+        self._raise_if_failed()
+
+    def close(self):
+        """ Flush pending writes, save to csv and stop the writer thread """
+        self._closed = True
+        if self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join()
+        self._raise_if_failed()
+
+    # --- writer thread ---
+
+    def _put(self, item):
+        """ Enqueue a write. Blocks when the queue is full so a slow writer throttles the simulation """
+        self._raise_if_failed()
+        if self._closed:
+            raise RuntimeError("SimulationDatastore is closed")
+        self._queue.put(item)
+
+    def _raise_if_failed(self):
+        """ Re-raise any error from the writer thread on the simulation thread """
+        if self._error is not None and not self._error_reported:
+            self._error_reported = True
+            self._closed = True
+            raise RuntimeError("Datastore writer thread failed") from self._error
+
+    def _run_writer(self):
+        try:
+            self.conn = sqlite3.connect(":memory:")
+            self.create_tables()
+        except Exception as e:
+            self._error = e
+            return
+        finally:
+            self._ready.set()
+
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                # stop whatever happens, so close() never waits on a thread that kept running
+                try:
+                    if self._error is None:
+                        self._save()
+                except Exception as e:
+                    self._error = e
+                finally:
+                    self.conn.close()
+                    self._queue.task_done()
+                return
+            try:
+                if self._error is None:
+                    func, args = item
+                    func(*args)
+                # after a failure, keep draining so blocked producers and flush() can proceed
+            except Exception as e:
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _insert_creature(self, *row):
         self.conn.execute("""
             INSERT INTO creatures (id, parent, generation, birth_time, max_speed, max_turn_rate, radius, energy_for_reproduction, time_between_reproduction, percent_energy_for_child, viewable_distance, fov, num_brain_nodes, num_brain_connections)
-            VALUES (:id, :parent, :generation, :birth_time, :max_speed, :max_turn_rate, :radius, :energy_for_reproduction, :time_between_reproduction, :percent_energy_for_child, :viewable_distance, :fov, :num_brain_nodes, :num_brain_connections)""",
-            {
-                "id": c.id,
-                "parent": c.parent,
-                "generation": c.generation,
-                "birth_time": time,
-                "max_speed": c.genome.max_speed,
-                "max_turn_rate": c.genome.max_turn_rate,
-                "radius": c.genome.radius,
-                "energy_for_reproduction": c.genome.energy_for_reproduction,
-                "time_between_reproduction": c.genome.time_between_reproduction,
-                "percent_energy_for_child": c.genome.percent_energy_for_child,
-                "viewable_distance": c.genome.viewable_distance,
-                "fov": c.genome.fov,
-                "num_brain_nodes": c.num_brain_nodes,
-                "num_brain_connections": c.num_brain_connections
-            })
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            row)
 
-    def mark_creature_dead(self, creature_id, time):
+    def _mark_creature_dead(self, time, creature_id):
         self.conn.execute(
             "UPDATE creatures SET death_time = ? WHERE id = ?",
             (time, creature_id)
         )
 
-    def update_real_time(self, time, num_creatures, num_food):
+    def _insert_real_time(self, time, num_creatures, num_food):
         self.conn.execute(
             "INSERT INTO real_time_stats VALUES (?, ?, ?)",
             (time, num_creatures, num_food)
         )
         self._autosave(time)
 
-    def update_collisions(self, time, bigger_creature_id, smaller_creature_id, damage):
+    def _insert_collision(self, time, bigger_creature_id, smaller_creature_id, damage):
         self.conn.execute(
             "INSERT INTO collisions VALUES (?, ?, ?, ?)",
             (time, bigger_creature_id, smaller_creature_id, damage)
         )
 
+    def _insert_population_stats(self, row):
+        placeholders = ", ".join("?" * len(row))
+        self.conn.execute(f"INSERT INTO population_stats VALUES ({placeholders})", row)
+
+    def _insert_memory_report(self, time, subsystem, counted_bytes, traced_bytes, objects):
+        self.conn.execute(
+            "INSERT INTO memory_report VALUES (?, ?, ?, ?, ?)",
+            (time, subsystem, counted_bytes, traced_bytes, objects)
+        )
+
+    def _measure_database_size(self):
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        self.database_bytes = page_count * page_size
+
     def _autosave(self, time):
         if time - self._last_save_time >= AUTOSAVE_INTERVAL:
-            self.save()
+            self._save()
             self._last_save_time = time
 
-    def save(self):
+    def _save(self):
         os.makedirs("data", exist_ok=True)
         pd.read_sql("SELECT * FROM creatures", self.conn).to_csv("data/creatures" + TITLE + str(SEED) + ".csv")
         pd.read_sql("SELECT * FROM real_time_stats", self.conn).to_csv("data/real_time_stats" + TITLE + str(SEED) + ".csv")
         pd.read_sql("SELECT * FROM collisions", self.conn).to_csv("data/collisions" + TITLE + str(SEED) + ".csv")
-
-    def close(self):
-        self.save()
-        self.conn.close()
\ No newline at end of file
+        pd.read_sql("SELECT * FROM population_stats", self.conn).to_csv("data/population_stats" + TITLE + str(SEED) + ".csv")
+        pd.read_sql("SELECT * FROM memory_report", self.conn).to_csv("data/memory_report" + TITLE + str(SEED) + ".csv")
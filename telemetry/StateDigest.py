@@ -0,0 +1,187 @@
+"""
+Determinism traces: hashes of the simulation state every N ticks.
+
+Record a trace with the headless runner (python headless.py --digest trace.jsonl), then compare two traces:
+    python -m telemetry.StateDigest trace_a.jsonl trace_b.jsonl
+    python -m telemetry.StateDigest trace_a.jsonl trace_b.jsonl --tolerance 1e-6
+Tolerance mode needs traces recorded with --digest-values and compares the stored values numerically.
+"""
+import argparse
+import hashlib
+import json
+import sys
+from array import array
+
+from config import DIGEST_INTERVAL
+
+FIELDS = ["ids", "positions", "energies", "genomes", "brains", "food"]
+RUN_META = {"seed": None, "control_interval": 1}  # header keys that must match, with their value when a trace lacks one
+
+
+def state_fields(simulation):
+    """ Flat float lists describing the simulation state, one per field. Creatures are ordered by id and food by position """
+    creatures = sorted(simulation.creatures, key=lambda c: c.id)
+
+    ids = []
+    positions = []
+    energies = []
+    genomes = []
+    brains = []
+    for c in creatures:
+        ids.append(c.id)
+        positions.extend((c.pos.x, c.pos.y, c.direction))
+        energies.append(c.energy)
+        genomes.extend(c.genome.values)
+        connections = sorted(c.brain.connections.items())
+        brains.extend((len(c.brain.nodes), len(connections)))
+        for (from_node, to_node), weight in connections:
+            brains.extend((from_node, to_node, weight))
+
+    food = []
+    for f in sorted(simulation.food.get_all(), key=lambda f: (f.pos.x, f.pos.y)):
+        food.extend((f.pos.x, f.pos.y, f.energy))
+
+    return {
+        "ids": ids,
+        "positions": positions,
+        "energies": energies,
+        "genomes": genomes,
+        "brains": brains,
+        "food": food,
+    }
+
+
+def digest(values):
+    return hashlib.sha1(array("d", values).tobytes()).hexdigest()[:16]
+
+
+class StateDigest:
+    """ Records a digest of every state field every `interval` ticks """
+
+    def __init__(self, interval=DIGEST_INTERVAL, store_values=False, meta=None):
+        self.interval = interval
+        self.store_values = store_values
+        self.meta = dict(meta or {})
+        self.records = []
+
+    def maybe_capture(self, simulation, tick):
+        if tick % self.interval == 0:
+            self.capture(simulation, tick)
+
+    def capture(self, simulation, tick):
+        fields = state_fields(simulation)
+        record = {
+            "tick": tick,
+            "time": simulation.time,
+            "digests": {name: digest(values) for name, values in fields.items()},
+        }
+        if self.store_values:
+            record["values"] = fields
+        self.records.append(record)
+        return record
+
+    def finish(self, simulation, tick):
+        """ Capture the last tick too, so runs of the same length end on the same record whatever the interval """
+        if not self.records or self.records[-1]["tick"] != tick:
+            self.capture(simulation, tick)
+
+    def save(self, path):
+        """ JSON lines: a header with run metadata, then one record per captured tick """
+        with open(path, "w") as f:
+            f.write(json.dumps({"interval": self.interval, "store_values": self.store_values, **self.meta}) + "\n")
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+
+
+def load_trace(path):
+    """ Returns (header, records) """
+    with open(path) as f:
+        lines = [json.loads(line) for line in f if line.strip()]
+    return lines[0], lines[1:]
+
+
+def _first_difference(a, b, tolerance):
+    """ (index, a value, b value) of the first element differing by more than tolerance, or None """
+    if len(a) != len(b):
+        return "length", len(a), len(b)
+    for i, (x, y) in enumerate(zip(a, b)):
+        if abs(x - y) > tolerance:
+            return i, x, y
+    return None
+
+
+def compare_meta(header_a, header_b):
+    """ [(key, a value, b value)] for the run settings that differ between two trace headers """
+    return [(key, header_a.get(key, default), header_b.get(key, default))
+            for key, default in RUN_META.items() if header_a.get(key, default) != header_b.get(key, default)]
+
+
+def compare_traces(records_a, records_b, tolerance=None):
+    """
+    Returns None if the traces match, otherwise a dict describing the first diverging tick and field.
+    Without a tolerance the digests must match exactly; with one, stored values may differ by up to tolerance.
+    Traces with no ticks in common, or that end on different ticks, don't match (field "ticks").
+    """
+    b_by_tick = {r["tick"]: r for r in records_b}
+    if not any(a["tick"] in b_by_tick for a in records_a):
+        return {"tick": None, "time": None, "field": "ticks", "reason": "no shared ticks",
+                "a": len(records_a), "b": len(records_b)}
+    for a in records_a:
+        b = b_by_tick.get(a["tick"])
+        if b is None:
+            continue
+        for field in FIELDS:
+            if tolerance is None or "values" not in a or "values" not in b:
+                if a["digests"][field] != b["digests"][field]:
+                    return {"tick": a["tick"], "time": a["time"], "field": field,
+                            "a": a["digests"][field], "b": b["digests"][field]}
+            else:
+                diff = _first_difference(a["values"][field], b["values"][field], tolerance)
+                if diff is not None:
+                    index, x, y = diff
+                    return {"tick": a["tick"], "time": a["time"], "field": field, "index": index, "a": x, "b": y}
+    if records_a[-1]["tick"] != records_b[-1]["tick"]:
+        return {"tick": None, "time": None, "field": "ticks", "reason": "different final tick",
+                "a": records_a[-1]["tick"], "b": records_b[-1]["tick"]}
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two determinism traces")
+    parser.add_argument("trace_a")
+    parser.add_argument("trace_b")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="compare stored values with this absolute tolerance (needs traces recorded with values)")
+    args = parser.parse_args(argv)
+
+    header_a, records_a = load_trace(args.trace_a)
+    header_b, records_b = load_trace(args.trace_b)
+    if args.tolerance is not None and not (header_a.get("store_values") and header_b.get("store_values")):
+        print("Tolerance mode needs both traces recorded with values; comparing digests exactly instead")
+
+    meta = compare_meta(header_a, header_b)
+    if meta:
+        for key, a, b in meta:
+            print(f"Traces were recorded with different {key}: {a!r} vs {b!r}")
+        return 1
+
+    shared = len({r["tick"] for r in records_a} & {r["tick"] for r in records_b})
+    result = compare_traces(records_a, records_b, args.tolerance)
+    if result is None:
+        print(f"Traces match over {shared} shared ticks")
+        return 0
+
+    if result["field"] == "ticks":
+        label = "records" if result["reason"] == "no shared ticks" else "final tick"
+        print(f"Traces don't cover the same ticks: {result['reason']} ({label} {result['a']} vs {result['b']})")
+        return 1
+    print(f"First divergence at tick {result['tick']} (t={result['time']:.3f}s) in field '{result['field']}'")
+    if "index" in result:
+        print(f"  element {result['index']}: {result['a']!r} vs {result['b']!r}")
+    else:
+        print(f"  digest {result['a']} vs {result['b']}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+"""
+Local control and live telemetry for headless runs (python headless.py --serve [port]).
+
+    GET  /metrics              latest per-tick metrics as json
+    GET  /events               the same metrics as server-sent events, every TELEMETRY_STREAM_INTERVAL seconds
+    GET  /snapshot             every living creature (id, position, energy, generation, genes) and the food count
+    POST /pause, /resume
+    POST /step?ticks=N         run N ticks while paused
+    POST /checkpoint           save the datastore tables to csv now and return a digest of the current state
+
+For example: curl -N localhost:8765/events, or curl -X POST localhost:8765/pause
+"""
+import asyncio
+import json
+import queue
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+from entities.Genome import Genome
+from telemetry.PhaseTimer import PHASES
+from telemetry.StateDigest import digest, state_fields
+from config import TELEMETRY_PORT, TELEMETRY_STREAM_INTERVAL
+
+COMMAND_TIMEOUT = 10  # seconds a request waits for the simulation thread to answer
+MAX_HEADER_LINES = 100
+STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    500: "Internal Server Error", 504: "Gateway Timeout",
+}
+
+# path -> (method, command run on the simulation thread, or None for reads of the published metrics)
+ROUTES = {
+    "/metrics": ("GET", None),
+    "/events": ("GET", None),
+    "/snapshot": ("GET", "snapshot"),
+    "/pause": ("POST", "pause"),
+    "/resume": ("POST", "resume"),
+    "/step": ("POST", "step"),
+    "/checkpoint": ("POST", "checkpoint"),
+}
+
+
+class TelemetryServer:
+    """
+    Asyncio HTTP server on a background thread, attached to a simulation run by its loop.
+    The loop calls publish() once per tick, which swaps in a new metrics dict the server only reads, and poll()
+    between ticks, which applies queued commands. Neither waits on the server, so update is never blocked.
+    """
+
+    def __init__(self, port=TELEMETRY_PORT, host="127.0.0.1", stream_interval=TELEMETRY_STREAM_INTERVAL):
+        self.host = host
+        self.port = port
+        self.stream_interval = stream_interval
+        self.paused = False
+        self._steps = 0  # ticks still to run while paused
+        self._latest = None  # metrics dict, replaced (never modified) by publish
+        self._commands = queue.SimpleQueue()  # (command, args, future) from the server thread, args already validated
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._error = None
+
+    # --- simulation thread API ---
+
+    def start(self):
+        """ Start serving in a background thread. Returns the bound port (useful with port=0) """
+        self._thread = threading.Thread(target=self._run, name="telemetry-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise RuntimeError(f"Telemetry server could not listen on {self.host}:{self.port}") from self._error
+        return self.port
+
+    def stop(self):
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+
+    def publish(self, simulation, tick):
+        """ Record this tick's metrics for the server to read. Call once per tick """
+        timer = simulation.phase_timer
+        phases_ms = None
+        if timer.enabled and timer.count:
+            row = timer.durations[(timer.count - 1) % timer.capacity]
+            phases_ms = dict(zip(PHASES, (1000 * row).tolist()))
+        self._latest = {
+            "tick": tick,
+            "time": simulation.time,
+            "paused": self.paused,
+            "num_creatures": len(simulation.creatures),
+            "num_food": len(simulation.food),
+            "phases_ms": phases_ms,
+            "gene_means": simulation.population_stats.means(),
+        }
+
+    def poll(self, simulation, tick):
+        """ Apply queued commands between ticks. Returns True if the loop should run a tick now """
+        while True:
+            try:
+                command, args, future = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                result = self._apply(command, args, simulation, tick)
+            except Exception as e:  # report to the client (as a 500) rather than stopping the run
+                result = {"error": repr(e)}
+            self._loop.call_soon_threadsafe(_resolve, future, result)
+
+        if not self.paused:
+            return True
+        if self._steps:
+            self._steps -= 1
+            return True
+        return False
+
+    def _apply(self, command, args, simulation, tick):
+        if command == "pause":
+            self.paused = True
+            self._republish()
+        elif command == "resume":
+            self.paused = False
+            self._steps = 0
+            self._republish()
+        elif command == "step":
+            self._steps += args["ticks"]
+            self._republish()
+            return {"tick": tick, "steps_queued": self._steps}
+        elif command == "checkpoint":
+            simulation.datastore.save()
+            simulation.datastore.flush()  # so the csv files are written when the client hears back
+            fields = state_fields(simulation)
+            return {"tick": tick, "time": simulation.time, "digests": {name: digest(values) for name, values in fields.items()}}
+        elif command == "snapshot":
+            return _snapshot(simulation, tick)
+        return {"tick": tick, "paused": self.paused}
+
+    def _republish(self):
+        """ publish() doesn't run while paused, so update the paused flag in the latest metrics directly """
+        if self._latest is not None:
+            self._latest = {**self._latest, "paused": self.paused}
+
+    # --- server thread ---
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self._server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            # end open event streams and requests before closing
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            for _ in range(MAX_HEADER_LINES):
+                if (await reader.readline()) in (b"\r\n", b"\n", b""):
+                    break
+            if len(request_line) < 2:
+                return await _respond(writer, 400, {"error": "bad request"})
+
+            method, target = request_line[0], urlsplit(request_line[1])
+            route = ROUTES.get(target.path)
+            if route is None:
+                return await _respond(writer, 404, {"error": f"unknown path {target.path}", "paths": sorted(ROUTES)})
+            expected_method, command = route
+            if method != expected_method:
+                return await _respond(writer, 405, {"error": f"use {expected_method} for {target.path}"})
+
+            if target.path == "/events":
+                return await self._stream(writer)
+            if command is None:
+                return await _respond(writer, 200, self._latest)
+
+            try:
+                args = _parse_args(command, parse_qs(target.query))
+            except ValueError as e:
+                return await _respond(writer, 400, {"error": str(e)})
+
+            future = self._loop.create_future()
+            self._commands.put((command, args, future))
+            try:
+                result = await asyncio.wait_for(future, COMMAND_TIMEOUT)
+            except asyncio.TimeoutError:
+                return await _respond(writer, 504, {"error": "the simulation did not answer in time"})
+            await _respond(writer, 500 if "error" in result else 200, result)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _stream(self, writer):
+        """ Server-sent events: one message per interval whenever a new tick was published """
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        sent = None
+        while True:
+            latest = self._latest
+            if latest is not None and latest is not sent:
+                writer.write(b"data: " + json.dumps(latest).encode() + b"\n\n")
+                await writer.drain()
+                sent = latest
+            await asyncio.sleep(self.stream_interval)
+
+
+def _parse_args(command, query):
+    """ Validated arguments for a command from its query string. Raises ValueError for bad values """
+    if command != "step":
+        return {}
+    value = query.get("ticks", ["1"])[0]
+    try:
+        ticks = int(value)
+    except ValueError:
+        raise ValueError(f"ticks must be a whole number, not {value!r}") from None
+    if ticks < 1:
+        raise ValueError(f"ticks must be at least 1, not {ticks}")
+    return {"ticks": ticks}
+
+
+def _resolve(future, result):
+    if not future.done():  # the request may have timed out
+        future.set_result(result)
+
+
+async def _respond(writer, status, body):
+    payload = json.dumps(body).encode()
+    writer.write(
+        f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+    )
+    await writer.drain()
+
+
+def _snapshot(simulation, tick):
+    return {
+        "tick": tick,
+        "time": simulation.time,
+        "num_food": len(simulation.food),
+        "genes": list(Genome.gene_names),
+        "creatures": [
+            {
+                "id": c.id,
+                "x": c.pos.x,
+                "y": c.pos.y,
+                "direction": c.direction,
+                "energy": c.energy,
+                "generation": c.generation,
+                "genes": c.genome.values.tolist(),
+            }
+            for c in simulation.creatures
+        ],
+    }
@@ -0,0 +1,174 @@
+"""
+Runs the simulation and the window in separate processes.
+
+    python viewer.py [seed] [--no-telemetry]
+
+The simulation process ticks as fast as it can and publishes snapshots to shared memory; this process renders the
+latest snapshot at display rate, so a slow frame never stalls the simulation. Ticks are identical to main.py for the
+same seed, the viewer only decides what is shown.
+While running: space pauses/plays, c toggles stopping at an hour, click a creature to follow it.
+"""
+import argparse
+import math
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from entities.Creature import Creature
+from entities.Food import Food
+from world.Camera import Camera
+from world.FoodRenderer import FoodRenderer
+from world.Menu import get_menu_font
+from world.SharedSnapshot import SharedSnapshot, C
+from world.SimulationWorker import run_worker
+from config import SEED, SIMULATION_HEIGHT, SIMULATION_WIDTH, FOOD_RADIUS, SNAPSHOT_MAX_CREATURES, SNAPSHOT_MAX_FOOD
+
+SCREEN_WIDTH = 1200
+SCREEN_HEIGHT = 800
+TARGET_FPS = 60
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+ANIMATION_FRAMES = 7  # draws per sprite frame, as in Creature.change_sprite_frame
+STOP_TIMEOUT = 30  # seconds to wait for the simulation process to save its data on exit
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the simulation in a worker process and view it here")
+    parser.add_argument("seed", nargs="?", type=int, default=SEED)
+    parser.add_argument("--no-telemetry", action="store_true", help="don't record or save the datastore")
+    parser.add_argument("--max-creatures", type=int, default=SNAPSHOT_MAX_CREATURES)
+    parser.add_argument("--max-food", type=int, default=SNAPSHOT_MAX_FOOD)
+    return parser.parse_args(argv)
+
+
+def draw_creatures(screen, camera, creatures, frame_count):
+    """ Draw snapshot creature rows exactly like Creature.draw, through the shared sprite cache """
+    left, top, width, height = camera.get_visible_area()
+    x, y = creatures[:, C["x"]], creatures[:, C["y"]]
+    visible = creatures[(x >= left) & (x < left + width) & (y >= top) & (y < top + height)]
+
+    sprite_cache = Creature.sprite_cache
+    for row in visible.tolist():
+        color = (int(row[C["color_r"]]), int(row[C["color_g"]]), int(row[C["color_b"]]))
+        frame = (frame_count // ANIMATION_FRAMES + int(row[C["id"]])) % 2
+        angle = -math.degrees(row[C["direction"]]) + 90 + 180
+        image = sprite_cache.get(color, frame, int(row[C["radius"]] * 2), angle, camera.zoom)
+        screen.blit(image, image.get_rect(center=camera.world_to_screen((row[C["x"]], row[C["y"]]))))
+
+
+def draw_food(screen, camera, renderer, food):
+    left, top, width, height = camera.get_visible_area()
+    x, y = food[:, 0], food[:, 1]
+    visible = food[(x >= left) & (x < left + width) & (y >= top) & (y < top + height)]
+    renderer.draw_positions(screen, camera, Food._sprite, visible)
+
+
+def draw_status(screen, font, frame, rate, connected):
+    lines = [
+        f"Time: {frame['time']:.1f}s  Population: {frame['population']:.0f}  Food: {frame['food_total']:.0f}",
+        f"{rate:.1f} sim-s / wall-s" + ("  (paused)" if frame["paused"] else ""),
+    ]
+    if not connected:
+        lines.append("Simulation process stopped")
+    for i, line in enumerate(lines):
+        screen.blit(font.render(line, True, WHITE), (10, 10 + i * font.get_linesize()))
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"Simulating with seed = {args.seed}")
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption("Evolution Simulation")
+    Creature._load_sprites()
+    Food._load_sprite(FOOD_RADIUS)
+    font = get_menu_font()
+
+    snapshot = SharedSnapshot.create(args.max_creatures, args.max_food)
+    # spawn so the worker starts from a clean interpreter with its own hidden display
+    context = multiprocessing.get_context("spawn")
+    conn, worker_conn = context.Pipe()
+    worker = context.Process(
+        target=run_worker,
+        args=(args.seed, snapshot.name, args.max_creatures, args.max_food, worker_conn, not args.no_telemetry),
+        name="simulation",
+    )
+    worker.start()
+
+    camera = Camera(SIMULATION_WIDTH, SIMULATION_HEIGHT)
+    food_renderer = FoodRenderer()
+    clock = pygame.time.Clock()
+
+    paused = False
+    followed = None
+    frame_count = 0
+    rate = 0.0
+    last_rate_check = (time.perf_counter(), 0.0)
+
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+                break
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                    conn.send(("pause", paused))
+                if event.key == pygame.K_c:
+                    conn.send(("stop_at_hour",))
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                conn.send(("click", *camera.screen_to_world(event.pos)))
+            camera.handle_event(event)
+
+        while conn.poll():
+            message = conn.recv()
+            if message[0] == "selected":
+                followed = message[1]
+                conn.send(("follow", followed))
+                if followed is not None:
+                    camera.zoom = 1.25  # same as Camera.center_creature
+
+        screen.fill(BLACK)
+        camera.update()
+        frame = snapshot.read()
+        if frame is not None:
+            creatures = frame["creatures"]
+            if followed is not None:
+                match = np.flatnonzero(creatures[:, C["id"]] == followed)
+                if len(match):
+                    camera.x, camera.y = creatures[match[0], C["x"]], creatures[match[0], C["y"]]
+                else:
+                    followed = None  # died
+
+            now = time.perf_counter()
+            if now - last_rate_check[0] >= 1.0:
+                rate = (frame["time"] - last_rate_check[1]) / (now - last_rate_check[0])
+                last_rate_check = (now, frame["time"])
+
+            draw_food(screen, camera, food_renderer, frame["food"])
+            draw_creatures(screen, camera, creatures, frame_count)
+            draw_status(screen, font, frame, rate, worker.is_alive())
+
+        pygame.display.flip()
+        clock.tick(TARGET_FPS)
+        frame_count += 1
+
+    # let the simulation process save its data before tearing down the shared memory
+    if worker.is_alive():
+        conn.send(("quit",))
+        while conn.poll(STOP_TIMEOUT):
+            if conn.recv()[0] == "stopped":
+                break
+        worker.join(STOP_TIMEOUT)
+    pygame.quit()
+    snapshot.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
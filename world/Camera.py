@@ -21,8 +21,19 @@ class Camera:
         self.pan_start_pos = (0, 0)
         self.pan_start_camera = (0, 0)
 
+        # Screen size, refreshed once per frame instead of once per drawn entity
+        self.screen_width = 0
+        self.screen_height = 0
+        self.refresh_screen_size()
+
+    def refresh_screen_size(self):
+        surface = pygame.display.get_surface()
+        if surface is not None:
+            self.screen_width, self.screen_height = surface.get_size()
+
     def update(self):
         """ If following a creature, keep camera centered on it """
+        self.refresh_screen_size()
         if self.followed_creature is not None:
             self.x = self.followed_creature.pos.x
             self.y = self.followed_creature.pos.y
@@ -30,7 +41,10 @@ class Camera:
     
     def handle_event(self, event):
         """ Handle camera-related events (zoom and pan) """
-        if event.type == pygame.MOUSEWHEEL:
+        if event.type == pygame.VIDEORESIZE:
+            self.refresh_screen_size()
+
+        elif event.type == pygame.MOUSEWHEEL:
             # Zoom with mouse wheel
             mouse_pos = pygame.mouse.get_pos()
             world_pos_before = self.screen_to_world(mouse_pos)
@@ -72,28 +86,22 @@ class Camera:
     
     def screen_to_world(self, screen_pos):
         """ Convert screen coordinates to world coordinates """
-        screen_width, screen_height = pygame.display.get_surface().get_size()
-        
-        world_x = self.x + (screen_pos[0] - screen_width / 2) / self.zoom
-        world_y = self.y + (screen_pos[1] - screen_height / 2) / self.zoom
+        world_x = self.x + (screen_pos[0] - self.screen_width / 2) / self.zoom
+        world_y = self.y + (screen_pos[1] - self.screen_height / 2) / self.zoom
         
         return (world_x, world_y)
     
     def world_to_screen(self, world_pos):
         """ Convert world coordinates to screen coordinates """
-        screen_width, screen_height = pygame.display.get_surface().get_size()
-        
-        screen_x = (world_pos[0] - self.x) * self.zoom + screen_width / 2
-        screen_y = (world_pos[1] - self.y) * self.zoom + screen_height / 2
+        screen_x = (world_pos[0] - self.x) * self.zoom + self.screen_width / 2
+        screen_y = (world_pos[1] - self.y) * self.zoom + self.screen_height / 2
         
         return (screen_x, screen_y)
     
     def get_visible_area(self):
         """ Get the visible world area as (left, top, width, height) """
-        screen_width, screen_height = pygame.display.get_surface().get_size()
-        
-        visible_width = screen_width / self.zoom
-        visible_height = screen_height / self.zoom
+        visible_width = self.screen_width / self.zoom
+        visible_height = self.screen_height / self.zoom
         
         left = self.x - visible_width / 2
         top = self.y - visible_height / 2
@@ -0,0 +1,45 @@
+import pygame
+
+
+class FoodRenderer:
+    """
+    Draws food in one batched blit call.
+    All food shares one sprite, so it is only rescaled when the sprite or the camera zoom changes.
+    """
+
+    def __init__(self):
+        self._image = None
+        self._zoom = None
+        self._scaled = None
+
+    def scaled_sprite(self, image, zoom):
+        if image is not self._image or zoom != self._zoom:
+            self._image = image
+            self._zoom = zoom
+            self._scaled = pygame.transform.scale_by(image, zoom)
+        return self._scaled
+
+    def draw(self, screen, camera, food):
+        """ Draw the given food items, each anchored at its top left corner like Food.draw """
+        if not food:
+            return
+        zoom = camera.zoom
+        image = self.scaled_sprite(food[0].image, zoom)
+        origin_x, origin_y = camera.world_to_screen((0, 0))
+
+        self._blit(screen, [(image, (origin_x + f.pos.x * zoom, origin_y + f.pos.y * zoom)) for f in food])
+
+    def draw_positions(self, screen, camera, image, positions):
+        """ Same as draw, for food given as an (n, 2) array of world positions (used by the shared memory viewer) """
+        if len(positions) == 0:
+            return
+        image = self.scaled_sprite(image, camera.zoom)
+        screen_positions = positions * camera.zoom + camera.world_to_screen((0, 0))
+        self._blit(screen, [(image, pos) for pos in screen_positions.tolist()])
+
+    @staticmethod
+    def _blit(screen, sequence):
+        if hasattr(screen, "fblits"):  # pygame-ce
+            screen.fblits(sequence)
+        else:
+            screen.blits(sequence, doreturn=False)
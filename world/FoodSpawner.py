@@ -1,4 +1,9 @@
+import bisect
+import math
 import random
+
+import numpy as np
+
 from entities.Food import Food
 from entities.Food import ENERGY_DENSITY
 from spacial.Point import Point
@@ -10,34 +15,47 @@ from config import (
     FOREST_SPAWN_WEIGHT_MIN,
     FOREST_SPAWN_WEIGHT_MAX,
     FOREST_MAX_SIZE, 
-    FOREST_MIN_SIZE
+    FOREST_MIN_SIZE,
+    BATCH_FOOD_SPAWNING
 )
 
+FOREST_CORE = 0.75  # forests spawn food evenly inside this fraction of their radius...
+FOREST_EDGE_ODDS = 1 / 3  # ...and at this relative density between it and the edge
+
 class FoodSpawner:
     def __init__(self, simulation, target_food_count):
         self.sim = simulation
         self.target_food_count = target_food_count
         self.forests = []
         self._world_weight = WORLD_SPAWN_WEIGHT
+        self._refresh_weights()
+        self._rng = None  # NumPy generator for batch spawning, seeded from random on first use
 
-    @property
-    def _total_weight(self):
-        """Sum of all forest weights plus the open-world weight."""
-        return sum(f.weight for f in self.forests) + self._world_weight
+    def _refresh_weights(self):
+        """Cache the spawn weights after the forests change: running totals for the default path and an alias table for batches."""
+        self._cumulative_weights = []
+        cumulative = 0
+        for forest in self.forests:
+            cumulative += forest.weight
+            self._cumulative_weights.append(cumulative)
+        # Sum of all forest weights plus the open-world weight
+        self._total_weight = sum(f.weight for f in self.forests) + self._world_weight
+        self._alias_prob, self._alias = _alias_table([f.weight for f in self.forests] + [self._world_weight])
 
-    def initialize_forests(self):
+    def initialize_forests(self, num_forests=NUM_INIT_FORESTS):
         """Create forests spread across the world."""
         avg_world_size = (self.sim.simulation_width + self.sim.simulation_height) / 2
         min_radius = int(avg_world_size * FOREST_MIN_SIZE)
         max_radius = int(avg_world_size * FOREST_MAX_SIZE)
         max_attempts_per_forest = 50
 
-        for _ in range(NUM_INIT_FORESTS):
+        for _ in range(num_forests):
             best_pos = self._find_best_forest_position(max_attempts_per_forest)
             wt = random.uniform(FOREST_SPAWN_WEIGHT_MIN, FOREST_SPAWN_WEIGHT_MAX)
             r_x = random.randint(min_radius, max_radius)
             r_y = random.randint(min_radius, max_radius)
             self.forests.append(Forest(best_pos, wt, r_x, r_y))
+        self._refresh_weights()
 
     def initialize_food(self):
         """Generate initial food distribution across forests and world."""
@@ -47,15 +65,26 @@ class FoodSpawner:
                 pos = self._spawn_point_in_forest(forest)
                 self.sim.food.insert(Food(pos, FOOD_RADIUS))
 
-        leftover_food = self.target_food_count - len(self.sim.food.get_all())
+        leftover_food = self.target_food_count - len(self.sim.food)
         for _ in range(leftover_food):
             pos = self._spawn_random_point()
             self.sim.food.insert(Food(pos, FOOD_RADIUS))
 
-    def spawn_food(self):
-        """Spawn food to maintain target count."""
+    def spawn_food(self, batch=BATCH_FOOD_SPAWNING):
+        """
+        Spawn food to maintain target count.
+        The batch path works out how many items the pool affords, samples all their positions with NumPy and bulk
+        inserts them. Same distribution as the default path but a different random stream.
+        """
         food_energy = ENERGY_DENSITY * FOOD_RADIUS ** 2
 
+        if batch:
+            count = int(self.sim.energy_pool // food_energy)
+            if count > 0:
+                self.sim.food.insert_many([Food(Point(x, y), FOOD_RADIUS) for x, y in self._sample_positions(count)])
+                self.sim.energy_pool -= count * food_energy
+            return
+
         while self.sim.energy_pool >= food_energy:
             pos = self._choose_spawn_position()
             self.sim.food.insert(Food(pos, FOOD_RADIUS))
@@ -88,13 +117,9 @@ class FoodSpawner:
     def _choose_spawn_position(self):
         """Choose a spawn position weighted by forest density vs open world."""
         r = random.random() * self._total_weight
-        cumulative = 0
-
-        for forest in self.forests:
-            cumulative += forest.weight
-            if r < cumulative:
-                return self._spawn_point_in_forest(forest)
-
+        i = bisect.bisect_right(self._cumulative_weights, r)  # first forest whose running total is above r
+        if i < len(self.forests):
+            return self._spawn_point_in_forest(self.forests[i])
         return self._spawn_random_point()
 
     def _spawn_random_point(self):
@@ -103,21 +128,88 @@ class FoodSpawner:
         return Point(x, y)
 
     def _spawn_point_in_forest(self, forest):
-        """Recursively find a valid point within a forest ellipse."""
-        x = forest.position.x + random.randint(-forest.radius_x, forest.radius_x)
-        y = forest.position.y + random.randint(-forest.radius_y, forest.radius_y)
-
-        if 0 < x < self.sim.simulation_width and 0 < y < self.sim.simulation_height:
-            nx = (x - forest.position.x) / forest.radius_x
-            ny = (y - forest.position.y) / forest.radius_y
-            norm = nx * nx + ny * ny
-
-            if norm > 1.0:
-                return self._spawn_point_in_forest(forest)
-
-            if (norm ** 0.5) <= 0.75:
-                return Point(x, y)
-            elif random.randint(0, 2) == 0:
-                return Point(x, y)
-
-        return self._spawn_point_in_forest(forest)
\ No newline at end of file
+        """Rejection sample a valid point within a forest ellipse."""
+        while True:
+            x = forest.position.x + random.randint(-forest.radius_x, forest.radius_x)
+            y = forest.position.y + random.randint(-forest.radius_y, forest.radius_y)
+
+            if 0 < x < self.sim.simulation_width and 0 < y < self.sim.simulation_height:
+                nx = (x - forest.position.x) / forest.radius_x
+                ny = (y - forest.position.y) / forest.radius_y
+                norm = nx * nx + ny * ny
+
+                if norm > 1.0:
+                    continue
+
+                if (norm ** 0.5) <= FOREST_CORE:
+                    return Point(x, y)
+                elif random.randint(0, 2) == 0:
+                    return Point(x, y)
+
+    # --- batch sampling ---
+
+    def _sample_positions(self, count):
+        """Returns a list of count (x, y) spawn positions, choosing forest or open world from the alias table."""
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        rng = self._rng
+
+        column = rng.integers(len(self._alias), size=count)
+        source = np.where(rng.random(count) < self._alias_prob[column], column, self._alias[column])
+
+        xs = np.empty(count)
+        ys = np.empty(count)
+        for i, forest in enumerate(self.forests):
+            chosen = np.flatnonzero(source == i)
+            if len(chosen):
+                xs[chosen], ys[chosen] = self._sample_forest(forest, len(chosen))
+        world = np.flatnonzero(source == len(self.forests))
+        xs[world] = rng.random(len(world)) * self.sim.simulation_width
+        ys[world] = rng.random(len(world)) * self.sim.simulation_height
+        return list(zip(xs.tolist(), ys.tolist()))
+
+    def _sample_forest(self, forest, count):
+        """
+        Polar sampling of count points in a forest ellipse: even density inside FOREST_CORE of the radius and
+        FOREST_EDGE_ODDS of it out to the edge, like the default path. Points off the world are redrawn.
+        """
+        rng = self._rng
+        core_area = FOREST_CORE ** 2
+        edge_area = (1 - core_area) * FOREST_EDGE_ODDS
+        xs = np.empty(count)
+        ys = np.empty(count)
+        pending = np.arange(count)
+        while len(pending):
+            n = len(pending)
+            # radius with area-uniform density in the core or the outer ring
+            in_core = rng.random(n) * (core_area + edge_area) < core_area
+            u = rng.random(n)
+            radius = np.where(in_core, FOREST_CORE * np.sqrt(u), np.sqrt(core_area + u * (1 - core_area)))
+            angle = rng.random(n) * (2 * math.pi)
+            x = forest.position.x + radius * forest.radius_x * np.cos(angle)
+            y = forest.position.y + radius * forest.radius_y * np.sin(angle)
+
+            valid = (0 < x) & (x < self.sim.simulation_width) & (0 < y) & (y < self.sim.simulation_height)
+            xs[pending[valid]] = x[valid]
+            ys[pending[valid]] = y[valid]
+            pending = pending[~valid]
+        return xs, ys
+
+
+def _alias_table(weights):
+    """Vose's alias method: returns (prob, alias) arrays for sampling index i with probability weights[i] / sum(weights) in O(1)."""
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+    # whatever is left has probability 1 up to rounding
+    return prob, alias
\ No newline at end of file
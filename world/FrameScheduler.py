@@ -0,0 +1,77 @@
+import time
+
+from config import FRAME_BUDGET_FPS, MAX_TICKS_PER_FRAME, THROUGHPUT_REFRESH_SECONDS
+
+SMOOTHING = 0.1  # weight of the newest measurement in the moving averages
+THROUGHPUT_SLICE = 0.1  # wall seconds of ticks between event checks in throughput mode
+RATE_WINDOW = 1.0  # wall seconds between sim-seconds per wall-second updates
+
+
+class FrameScheduler:
+    """
+    Decides how many simulation ticks to run per frame in uncapped mode.
+    Keeps moving averages of the cost of one tick and of one render, and fills the frame budget (1 / FRAME_BUDGET_FPS)
+    with as many ticks as fit after the render. In throughput mode rendering is skipped except once every
+    refresh_seconds, and ticks run in short slices so input is still handled.
+    """
+
+    def __init__(self, target_fps=FRAME_BUDGET_FPS, max_ticks=MAX_TICKS_PER_FRAME, refresh_seconds=THROUGHPUT_REFRESH_SECONDS):
+        self.frame_budget = 1.0 / target_fps
+        self.max_ticks = max_ticks
+        self.refresh_seconds = refresh_seconds
+        self.throughput_mode = False
+
+        self.tick_cost = None  # seconds, moving average
+        self.render_cost = None  # seconds, moving average
+        self.last_render = 0.0
+
+        self.sim_rate = 0.0  # achieved sim-seconds per wall-second
+        self._rate_start = None
+
+    @staticmethod
+    def _average(current, value):
+        return value if current is None else current + SMOOTHING * (value - current)
+
+    def ticks_for_frame(self):
+        """ Number of ticks to run before the next render """
+        if self.tick_cost is None:
+            return 1
+        if self.throughput_mode:
+            budget = THROUGHPUT_SLICE
+        else:
+            budget = self.frame_budget - (self.render_cost or 0.0)
+        return max(1, min(self.max_ticks, int(budget / max(self.tick_cost, 1e-6))))
+
+    def run_ticks(self, step, count):
+        """ Call step() count times and fold the measured cost per tick into the average """
+        start = time.perf_counter()
+        for _ in range(count):
+            step()
+        self.tick_cost = self._average(self.tick_cost, (time.perf_counter() - start) / count)
+
+    def should_render(self):
+        if not self.throughput_mode:
+            return True
+        return time.perf_counter() - self.last_render >= self.refresh_seconds
+
+    def record_render(self, start):
+        """ Record a render that began at perf_counter() time start """
+        now = time.perf_counter()
+        self.render_cost = self._average(self.render_cost, now - start)
+        self.last_render = now
+
+    def toggle_throughput_mode(self):
+        self.throughput_mode = not self.throughput_mode
+        self.last_render = 0.0
+        return self.throughput_mode
+
+    def update_rate(self, sim_time):
+        """ Call once per loop with the simulation time, refreshes sim_rate every RATE_WINDOW wall seconds """
+        now = time.perf_counter()
+        if self._rate_start is None:
+            self._rate_start = (now, sim_time)
+            return
+        wall_start, sim_start = self._rate_start
+        if now - wall_start >= RATE_WINDOW:
+            self.sim_rate = (sim_time - sim_start) / (now - wall_start)
+            self._rate_start = (now, sim_time)
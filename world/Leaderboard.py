@@ -0,0 +1,35 @@
+import heapq
+
+from config import LEADERBOARD_REFRESH_INTERVAL
+
+
+class Leaderboard:
+    """
+    The top k creatures by a stat (energy by default), recomputed with a bounded heap at most once every
+    refresh_interval seconds of simulation time instead of sorting the whole population every frame.
+    Ties keep population order, the same as a stable sort.
+    """
+
+    def __init__(self, k, key=lambda c: c.energy, refresh_interval=LEADERBOARD_REFRESH_INTERVAL):
+        self.k = k
+        self.key = key
+        self.refresh_interval = refresh_interval
+        self.top = []
+        self._last_refresh = None
+
+    def resize(self, k):
+        if k != self.k:
+            self.k = k
+            self._last_refresh = None  # refresh on the next update
+
+    def update(self, creatures, time):
+        """ Recompute the top k if the refresh interval has passed. Returns True if it was recomputed """
+        if self._last_refresh is not None and time - self._last_refresh < self.refresh_interval:
+            return False
+        self._last_refresh = time
+        self.top = heapq.nlargest(self.k, creatures, key=self.key)
+        return True
+
+    def entries(self):
+        """ The current top creatures, best first, leaving out any that died since the last refresh """
+        return [c for c in self.top if c.energy > 0]
@@ -0,0 +1,98 @@
+import math
+import time
+
+import numpy as np
+import pygame
+
+from world.FoodRenderer import FoodRenderer
+from config import LOD_SPRITE_ZOOM, LOD_HEATMAP_ZOOM
+
+TIERS = ["sprites", "circles", "heatmap"]
+FRAME_TIME_SMOOTHING = 0.1  # weight of the newest frame in the per-tier moving average
+
+HEATMAP_FOOD_COLOR = np.array([92, 169, 4], dtype=np.float32)  # same green as Food.color
+HEATMAP_CREATURE_COLOR = np.array([255, 60, 255], dtype=np.float32)
+
+
+class LodRenderer:
+    """
+    Level of detail rendering chosen by camera zoom.
+    Above LOD_SPRITE_ZOOM creatures are full sprites, down to LOD_HEATMAP_ZOOM they are plain coloured circles,
+    and below that food and creature density is drawn as one heatmap surface built from the spatial indexes.
+    Keeps a moving average of the frame time spent in each tier.
+    """
+
+    def __init__(self, sprite_zoom=LOD_SPRITE_ZOOM, heatmap_zoom=LOD_HEATMAP_ZOOM):
+        self.sprite_zoom = sprite_zoom
+        self.heatmap_zoom = heatmap_zoom
+        self.food_renderer = FoodRenderer()
+        self.tier = None
+        self.frame_ms = {tier: None for tier in TIERS}
+
+    def tier_for(self, zoom):
+        if zoom >= self.sprite_zoom:
+            return "sprites"
+        if zoom >= self.heatmap_zoom:
+            return "circles"
+        return "heatmap"
+
+    def draw(self, screen, camera, simulation):
+        start = time.perf_counter()
+        self.tier = self.tier_for(camera.zoom)
+
+        if self.tier == "heatmap":
+            self.draw_heatmap(screen, camera, simulation)
+        else:
+            visible_area = camera.get_visible_area()
+            self.food_renderer.draw(screen, camera, simulation.visible_food(visible_area))
+            creatures = simulation.visible_creatures(visible_area)
+            if self.tier == "sprites":
+                for c in creatures:
+                    c.draw(screen, camera)
+            else:
+                self.draw_circles(screen, camera, creatures)
+
+        elapsed_ms = 1000 * (time.perf_counter() - start)
+        previous = self.frame_ms[self.tier]
+        self.frame_ms[self.tier] = elapsed_ms if previous is None else previous + FRAME_TIME_SMOOTHING * (elapsed_ms - previous)
+
+    def draw_circles(self, screen, camera, creatures):
+        zoom = camera.zoom
+        origin_x, origin_y = camera.world_to_screen((0, 0))
+        for c in creatures:
+            color = (int(c.genome.color_r), int(c.genome.color_g), int(c.genome.color_b))
+            center = (origin_x + c.pos.x * zoom, origin_y + c.pos.y * zoom)
+            pygame.draw.circle(screen, color, center, max(1, c.genome.radius * zoom))
+
+    def draw_heatmap(self, screen, camera, simulation):
+        grid = simulation.creature_grid
+        cell_size = grid.cell_size
+        cols = math.ceil(simulation.simulation_width / cell_size)
+        rows = math.ceil(simulation.simulation_height / cell_size)
+
+        creatures = np.zeros((cols, rows), dtype=np.float32)
+        for (cx, cy), cell in grid.cells.items():
+            if cell and 0 <= cx < cols and 0 <= cy < rows:
+                creatures[cx, cy] += len(cell)
+
+        # spread each QuadTree leaf's food evenly over the grid cells it covers
+        food = np.zeros((cols, rows), dtype=np.float32)
+        stack = [simulation.food]
+        while stack:
+            node = stack.pop()
+            if node.divided:
+                stack.extend(node.children)
+            elif node.contents:
+                x0, y0 = int(node.top_left.x // cell_size), int(node.top_left.y // cell_size)
+                x1 = max(x0 + 1, math.ceil(node.bottom_right.x / cell_size))
+                y1 = max(y0 + 1, math.ceil(node.bottom_right.y / cell_size))
+                food[x0:x1, y0:y1] += len(node.contents) / ((x1 - x0) * (y1 - y0))
+
+        # square root so sparse areas stay visible next to dense forests and clusters
+        food_level = np.sqrt(food / food.max()) if food.max() > 0 else food
+        creature_level = np.sqrt(creatures / creatures.max()) if creatures.max() > 0 else creatures
+        rgb = food_level[..., None] * HEATMAP_FOOD_COLOR + creature_level[..., None] * HEATMAP_CREATURE_COLOR
+        surface = pygame.surfarray.make_surface(np.minimum(rgb, 255).astype(np.uint8))
+
+        size = (max(1, round(cols * cell_size * camera.zoom)), max(1, round(rows * cell_size * camera.zoom)))
+        screen.blit(pygame.transform.scale(surface, size), camera.world_to_screen((0, 0)))
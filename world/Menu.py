@@ -1,8 +1,11 @@
 import pygame
+from world.Leaderboard import Leaderboard
 from config import SEED, TITLE
 
 SYS_FONT = None
 BUTTON_HEIGHT = 60
+TIMINGS_WIDTH = 300
+TIMINGS_REFRESH_FRAMES = 30  # re-render the phase timing overlay every N frames
 
 # Create font once at module level
 _MENU_FONT = None
@@ -21,23 +24,36 @@ class Menu:
         self.font = get_menu_font()  # Reuse cached font
         self.creatures = []
         self.num_food = 0
+        self.sim_rate = None
 
-        self.buttons = []
+        self.buttons = []  # buttons currently shown, best first
+        self._buttons_by_id = {}
+        self.leaderboard = Leaderboard(self.visible_button_count())
         
         # Cache for rendered stats text
         self._stats_cache = {}
         self._last_stats = None
 
-    def update_stats(self, simulation):
+        self._timing_lines = []
+        self._timing_frames = 0
+
+    def visible_button_count(self):
+        """ Number of creature buttons that fit below the stats """
+        return max(0, (self.menu_height - BUTTON_HEIGHT - 10) // BUTTON_HEIGHT)
+
+    def update_stats(self, simulation, sim_rate=None):
         self.creatures = simulation.creatures
-        self.num_food = len(simulation.food.get_all())
+        self.leaderboard.update(simulation.creatures, simulation.time)
+        self.num_food = len(simulation.food)
+        self.sim_rate = sim_rate
 
     def display_stats(self, screen):
         num_creatures = len(self.creatures)
         num_food = self.num_food
 
         # Cache key
-        stats_key = (num_creatures, num_food)
+        sim_rate = None if self.sim_rate is None else round(self.sim_rate, 1)
+        stats_key = (num_creatures, num_food, sim_rate)
         
         # Only re-render if stats changed
         if stats_key != self._last_stats:
@@ -46,6 +62,8 @@ class Menu:
                 self.font.render(f"Creatures: {num_creatures}", True, (255, 255, 255)),
                 self.font.render(f"Food: {num_food}", True, (255, 255, 255)),
             ]
+            if sim_rate is not None:
+                self._stats_lines.append(self.font.render(f"Speed: {sim_rate:.1f} sim-s/s", True, (255, 255, 255)))
             self._last_stats = stats_key
         
         # text_surface = self._stats_cache
@@ -95,6 +113,29 @@ class Menu:
 
 
 
+    def show_phase_timings(self, screen, phase_timer, sprite_cache=None, renderer=None):
+        """ Overlay the per-phase tick time breakdown in the top right corner """
+        if self._timing_frames % TIMINGS_REFRESH_FRAMES == 0:
+            white = (255, 255, 255)
+            summary = phase_timer.summary(last=TIMINGS_REFRESH_FRAMES * 2)
+            total_ms = sum(ms for _, ms, _, _ in summary)
+            self._timing_lines = [
+                self.font.render(f"Tick: {total_ms:.2f} ms  Pop: {phase_timer.mean_population():.0f}", True, white)
+            ]
+            for name, ms, share, _ in summary:
+                self._timing_lines.append(self.font.render(f"{name}: {ms:.2f} ms ({share:.0%})", True, white))
+            if renderer is not None and renderer.tier is not None:
+                self._timing_lines.append(self.font.render(
+                    f"Render ({renderer.tier}): {renderer.frame_ms[renderer.tier]:.2f} ms", True, white))
+            if sprite_cache is not None:
+                self._timing_lines.append(self.font.render(
+                    f"Sprites: {len(sprite_cache)} cached ({sprite_cache.bytes / 2**20:.0f} MB), {sprite_cache.hit_rate:.0%} hits", True, white))
+        self._timing_frames += 1
+
+        x, y = screen.get_width() - TIMINGS_WIDTH, 10
+        for i, surf in enumerate(self._timing_lines):
+            screen.blit(surf, (x, y + i * self.font.get_linesize()))
+
     def draw(self, screen):
         # Draw menu background
         self.menu_height = screen.get_height()
@@ -104,38 +145,32 @@ class Menu:
         self.update_buttons(screen)
 
     def update_buttons(self, screen):
-        # Reuse existing buttons instead of recreating
-        cur_y = BUTTON_HEIGHT + 10
+        # Only the top creatures that fit in the menu get buttons, reused by creature id
+        self.leaderboard.resize(self.visible_button_count())
         cursor = pygame.mouse.get_pos()
 
-        # Resize button list if needed
-        while len(self.buttons) < len(self.creatures):
-            self.buttons.append(None)
-        while len(self.buttons) > len(self.creatures):
-            self.buttons.pop()
-
-        sorted_creatures = sorted(self.creatures, key=lambda c: c.energy, reverse=True)
-
-        # Update or create buttons
-        for i, creature in enumerate(sorted_creatures):
-            if cur_y + BUTTON_HEIGHT > self.menu_height:
-                break  # Stop if we exceed menu height
-
-            if self.buttons[i] is None or self.buttons[i].creature != creature:
-                self.buttons[i] = CreatureButton(creature, pygame.Rect(10, cur_y, self.menu_width - 20, BUTTON_HEIGHT))
+        buttons = []
+        cur_y = BUTTON_HEIGHT + 10
+        for creature in self.leaderboard.entries():
+            button = self._buttons_by_id.get(creature.id)
+            if button is None:
+                button = CreatureButton(creature, pygame.Rect(10, cur_y, self.menu_width - 20, BUTTON_HEIGHT))
             else:
-                # Update rect position if creature is the same
-                self.buttons[i].rect.y = cur_y
+                button.rect.y = cur_y
+            buttons.append(button)
             cur_y += BUTTON_HEIGHT
-        
+
+        self.buttons = buttons
+        self._buttons_by_id = {b.creature.id: b for b in buttons}
+
         for b in self.buttons:
-            if b is not None:
-                b.draw(screen, cursor, selected=False)
+            b.draw(screen, cursor, selected=False)
 
     def get_clicked_button(self, pos):
-        for b in self.buttons:
-            if b is not None and b.hit(pos):
-                return b
+        # buttons are stacked from the top, so only the one at the clicked row can be hit
+        index = (pos[1] - (BUTTON_HEIGHT + 10)) // BUTTON_HEIGHT
+        if 0 <= index < len(self.buttons) and self.buttons[index].hit(pos):
+            return self.buttons[index]
         return None
 
 class CreatureButton:
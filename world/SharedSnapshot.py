@@ -0,0 +1,128 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import SNAPSHOT_MAX_CREATURES, SNAPSHOT_MAX_FOOD
+
+HEADER_FIELDS = ["seq", "time", "tick", "num_creatures", "num_food", "population", "food_total", "paused", "followed"]
+CREATURE_FIELDS = ["id", "x", "y", "direction", "radius", "color_r", "color_g", "color_b", "energy"]
+FOOD_FIELDS = ["x", "y"]
+
+H = {name: i for i, name in enumerate(HEADER_FIELDS)}
+C = {name: i for i, name in enumerate(CREATURE_FIELDS)}
+
+_FLOAT = np.dtype(np.float64).itemsize
+
+
+class SharedSnapshot:
+    """
+    Double-buffered simulation state in a multiprocessing.shared_memory block, written by one process and read by another.
+    The writer fills the buffer the reader is not pointed at, then flips the pointer. Each buffer carries a sequence
+    number that is odd while it is being written, so a reader that raced a write (seqlock style) retries instead of
+    rendering a torn frame. Only the first max_creatures creatures and max_food food items are published.
+    """
+
+    def __init__(self, shm, max_creatures, max_food, owner):
+        self.shm = shm
+        self.max_creatures = max_creatures
+        self.max_food = max_food
+        self.owner = owner
+
+        buffer_size = len(HEADER_FIELDS) + max_creatures * len(CREATURE_FIELDS) + max_food * len(FOOD_FIELDS)
+        memory = np.ndarray((1 + 2 * buffer_size,), dtype=np.float64, buffer=shm.buf)
+        self._latest = memory[0:1]
+        self._headers = []
+        self._creatures = []
+        self._food = []
+        offset = 1
+        for _ in range(2):
+            self._headers.append(memory[offset:offset + len(HEADER_FIELDS)])
+            offset += len(HEADER_FIELDS)
+            size = max_creatures * len(CREATURE_FIELDS)
+            self._creatures.append(memory[offset:offset + size].reshape(max_creatures, len(CREATURE_FIELDS)))
+            offset += size
+            size = max_food * len(FOOD_FIELDS)
+            self._food.append(memory[offset:offset + size].reshape(max_food, len(FOOD_FIELDS)))
+            offset += size
+
+    @staticmethod
+    def size_bytes(max_creatures, max_food):
+        buffer_size = len(HEADER_FIELDS) + max_creatures * len(CREATURE_FIELDS) + max_food * len(FOOD_FIELDS)
+        return (1 + 2 * buffer_size) * _FLOAT
+
+    @classmethod
+    def create(cls, max_creatures=SNAPSHOT_MAX_CREATURES, max_food=SNAPSHOT_MAX_FOOD):
+        shm = shared_memory.SharedMemory(create=True, size=cls.size_bytes(max_creatures, max_food))
+        snapshot = cls(shm, max_creatures, max_food, owner=True)
+        snapshot._latest[0] = 0
+        for header in snapshot._headers:
+            header[:] = 0
+        return snapshot
+
+    @classmethod
+    def attach(cls, name, max_creatures=SNAPSHOT_MAX_CREATURES, max_food=SNAPSHOT_MAX_FOOD):
+        return cls(shared_memory.SharedMemory(name=name), max_creatures, max_food, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, simulation, tick, paused=False, followed=None):
+        """ Write the simulation state into the back buffer, then make it the latest """
+        index = 1 - int(self._latest[0])
+        header = self._headers[index]
+        header[H["seq"]] += 1  # odd: write in progress
+
+        creatures = simulation.creatures[:self.max_creatures]
+        if creatures:
+            self._creatures[index][:len(creatures)] = [
+                (c.id, c.pos.x, c.pos.y, c.direction, c.genome.radius, c.genome.color_r, c.genome.color_g, c.genome.color_b, c.energy)
+                for c in creatures
+            ]
+        food = simulation.food.get_all()
+        num_food = min(len(food), self.max_food)
+        if num_food:
+            self._food[index][:num_food] = [(f.pos.x, f.pos.y) for f in food[:num_food]]
+
+        header[H["time"]] = simulation.time
+        header[H["tick"]] = tick
+        header[H["num_creatures"]] = len(creatures)
+        header[H["num_food"]] = num_food
+        header[H["population"]] = len(simulation.creatures)
+        header[H["food_total"]] = len(food)
+        header[H["paused"]] = paused
+        header[H["followed"]] = -1 if followed is None else followed
+
+        header[H["seq"]] += 1  # even: complete
+        self._latest[0] = index
+
+    def read(self, retries=10):
+        """
+        Copy of the latest complete snapshot as a dict of header values plus "creatures" and "food" arrays,
+        or None if nothing has been published yet (or every retry raced a write)
+        """
+        for _ in range(retries):
+            index = int(self._latest[0])
+            header = self._headers[index]
+            seq = header[H["seq"]]
+            if seq == 0 or seq % 2 == 1:
+                continue
+
+            values = header.copy()
+            creatures = self._creatures[index][:int(values[H["num_creatures"]])].copy()
+            food = self._food[index][:int(values[H["num_food"]])].copy()
+
+            if header[H["seq"]] == seq:
+                frame = {name: values[i] for name, i in H.items()}
+                frame["creatures"] = creatures
+                frame["food"] = food
+                return frame
+        return None
+
+    def close(self):
+        # drop the numpy views first, shared memory can't be closed while they are exported
+        self._latest = None
+        self._headers = self._creatures = self._food = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
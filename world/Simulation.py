@@ -7,29 +7,43 @@ from entities.Genome import Genome
 from spacial.Point import Point
 from spacial.QuadTree import QuadTree
 from world.FoodSpawner import FoodSpawner
+from world.LodRenderer import LodRenderer
 from spacial.SpacialHashGrid import SpatialHashGrid
-from config import EQUAL_RADIUS_DAMAGE_MULTIPLIER, NUM_INIT_CREATURE, NUM_INIT_FOOD, DAMAGE_SCALAR
+from telemetry.PopulationStats import PopulationStats
+from telemetry.PhaseTimer import PhaseTimer
+from telemetry.MemoryReport import MemoryReport
+from config import EQUAL_RADIUS_DAMAGE_MULTIPLIER, NUM_INIT_CREATURE, NUM_INIT_FOOD, DAMAGE_SCALAR, MEMORY_REPORT, RENDER_CULL_MARGIN, BATCH_GENOME_MUTATION, CONTROL_INTERVAL
 
 CELL_SIZE = 100  # determines how large each spacial hash grid cell is
+MAX_CREATURE_RADIUS = Genome.gene_metadata["radius"]["max"]  # reach of the contact-only query on ticks a creature doesn't think
 
 class Simulation:
-    def __init__(self, world_width, world_height, datastore):
+    def __init__(self, world_width, world_height, datastore, num_init_creature=NUM_INIT_CREATURE, num_init_food=NUM_INIT_FOOD, control_interval=CONTROL_INTERVAL):
         self.simulation_width = world_width
         self.simulation_height = world_height
         self.datastore = datastore
         self.time = 0  # in seconds
+        self.tick = 0
+        # creatures sense and think on one tick in every control_interval, staggered by id into that many groups
+        self.control_interval = control_interval
         self.creatures = []
         self.creature_grid = SpatialHashGrid(CELL_SIZE)
         self.food = QuadTree(Point(0, 0), Point(world_width, world_height), 10, 10)
         # self.creature_tree = QuadTree(Point(0, 0), Point(world_width, world_height), 10, 10)
         self.next_creature_id = 1
-        self.food_spawner = FoodSpawner(self, NUM_INIT_FOOD)
+        self.num_init_creature = num_init_creature
+        self.food_spawner = FoodSpawner(self, num_init_food)
         self.energy_pool = 0 
         self.stop_at_hour = True
+        self.population_stats = PopulationStats()
+        self.phase_timer = PhaseTimer()
+        self.memory_report = MemoryReport() if MEMORY_REPORT else None
+        self.renderer = LodRenderer()
+        self.lineage = None  # optional analytics.LineageIndex, built incrementally as creatures are born and die
 
     def initialize(self):
         # randomly generate creatures throughout world
-        for _ in range(NUM_INIT_CREATURE):
+        for _ in range(self.num_init_creature):
             pos = self.spawn_random_point()
             default_genome = Genome.create_default()
             creature = Creature(self.next_creature_id, pos, default_genome)
@@ -40,7 +54,8 @@ class Simulation:
             creature.genome.color_b = random.randint(Genome.gene_metadata["color_b"]["min"], Genome.gene_metadata["color_r"]["max"])
 
             self.creatures.append(creature)
-            self.datastore.add_new_creature(creature, self.time)
+            self.creature_grid.insert(creature, pos.x, pos.y)  # so the first frame can be drawn before the first tick
+            self.register_birth(creature)
             # self.creature_tree.insert(creature)
             self.next_creature_id += 1
 
@@ -48,7 +63,8 @@ class Simulation:
         self.food_spawner.initialize_forests()
         self.food_spawner.initialize_food()
 
-        self.datastore.update_real_time(self.time, len(self.creatures), len(self.food.get_all()))
+        self.datastore.update_real_time(self.time, len(self.creatures), len(self.food))
+        self.population_stats.maybe_sample(self.time, self.datastore)
 
     def spawn_random_point(self):
         x = self.simulation_width * random.random()
@@ -62,50 +78,123 @@ class Simulation:
             return
 
         self.time += dt
+        self.tick += 1
+        clock = self.phase_timer.clock
+        population = len(self.creatures)
+
+        tick_start = clock()
         self.creature_grid.clear_frame()
 
         for c in self.creatures:
             self.creature_grid.insert(c, c.pos.x, c.pos.y)
+        t_grid = clock()
+
+        food_query_time = creature_query_time = update_time = contact_time = 0.0
+        food_candidates = creature_candidates = 0
+        interval = self.control_interval
         for c in self.creatures:
-            r = c.genome.viewable_distance
-            nearby_food = self.food.get_nearby(c.pos, c.genome.viewable_distance)
+            think = interval == 1 or (self.tick + c.id) % interval == 0
+            t0 = clock()
+            if think:
+                r = c.view_distance
+                nearby_food = self.food.get_nearby(c.pos, r)
+            else:
+                # moving on held outputs, only creatures close enough to touch are needed
+                r = c.genome.radius + MAX_CREATURE_RADIUS
+                nearby_food = ()
+            t1 = clock()
             nearby_creatures = self.creature_grid.query_rectangle(c.pos.x - r, c.pos.y - r, c.pos.x + r, c.pos.y + r)
-            c.update(dt, nearby_food, nearby_creatures)
+            t2 = clock()
+            c.update(dt, nearby_food, nearby_creatures, think)
+            t3 = clock()
 
             # nearby_contact = self.creature_grid.query_rectangle(c.pos.x - c.genome.radius, c.pos.y - c.genome.radius, c.pos.x + c.genome.radius, c.pos.y + c.genome.radius)
             self.handle_contact(c, nearby_creatures)
+            t4 = clock()
 
-        self.handle_eating()
+            food_query_time += t1 - t0
+            creature_query_time += t2 - t1
+            update_time += t3 - t2
+            contact_time += t4 - t3
+            food_candidates += len(nearby_food)
+            creature_candidates += len(nearby_creatures)
+
+        t_creatures = clock()
+        eating_candidates = self.handle_eating()
+        t_eating = clock()
 
         any_died = self.handle_creature_death()
-        
+        t_death = clock()
 
         any_reproduced = self.handle_reproduction()
+        t_reproduction = clock()
 
         if any_died or any_reproduced:
-            self.datastore.update_real_time(self.time, len(self.creatures), len(self.food.get_all()))
+            self.datastore.update_real_time(self.time, len(self.creatures), len(self.food))
+        self.population_stats.maybe_sample(self.time, self.datastore)
+        if self.memory_report is not None:
+            self.memory_report.maybe_sample(self)
+        t_telemetry = clock()
 
         self.food_spawner.spawn_food()
+        t_end = clock()
+
+        self.phase_timer.record_tick(
+            tick_start, self.time, population,
+            (
+                t_grid - tick_start,
+                food_query_time,
+                creature_query_time,
+                update_time,
+                contact_time,
+                t_eating - t_creatures,
+                t_death - t_eating,
+                t_reproduction - t_death,
+                t_telemetry - t_reproduction,
+                t_end - t_telemetry,
+            ),
+            (population, food_candidates, creature_candidates, population, creature_candidates, eating_candidates, population, population, 0, 0),
+        )
 
     def draw(self, screen, camera):
-        visible_area = camera.get_visible_area()
+        self.renderer.draw(screen, camera, self)
+
+    def visible_food(self, visible_area):
+        """ Food inside the (left, top, width, height) world area """
         visible_rect = pygame.Rect(visible_area)
+        left, top, width, height = visible_area
+        nearby_food = self.food.query_rectangle(left, top, left + width, top + height)
+        return [f for f in nearby_food if visible_rect.collidepoint(f.pos.x, f.pos.y)]
 
-        for f in self.food.get_all():
-            if visible_rect.collidepoint(f.pos.x, f.pos.y):
-                f.draw(screen, camera)
+    def visible_creatures(self, visible_area):
+        """ Creatures inside the (left, top, width, height) world area """
+        visible_rect = pygame.Rect(visible_area)
+        left, top, width, height = visible_area
 
-        for c in self.creatures:
-            if visible_rect.collidepoint(c.pos.x, c.pos.y):
-                c.draw(screen, camera)
+        # the grid was built before creatures moved this tick (newborns are added as they are born), so pad the query
+        # and check current positions. Zoomed far out, scanning every creature is cheaper than visiting every cell
+        left, top = left - RENDER_CULL_MARGIN, top - RENDER_CULL_MARGIN
+        right, bottom = left + width + 2 * RENDER_CULL_MARGIN, top + height + 2 * RENDER_CULL_MARGIN
+        num_cells = (right - left) * (bottom - top) / (CELL_SIZE * CELL_SIZE)
+        if num_cells < len(self.creatures):
+            candidates = self.creature_grid.query_rectangle(left, top, right, bottom)
+        else:
+            candidates = self.creatures
+
+        return [c for c in candidates if c.energy > 0 and visible_rect.collidepoint(c.pos.x, c.pos.y)]
 
     def handle_eating(self):
+        """ Transfer energy from touched food to creatures. Returns the number of food candidates checked """
         # check for collisions between creatures and food
         eaten = set()
+        candidates = 0
         for c in self.creatures:
-            for f in self.food.get_nearby(c.pos, c.genome.radius + 10):  # MAX_FOOD_RADIUS = 10
+            radius = c.genome.radius
+            nearby_food = self.food.get_nearby(c.pos, radius + 10)  # MAX_FOOD_RADIUS = 10
+            candidates += len(nearby_food)
+            for f in nearby_food:
                 dist = (c.pos.x - f.pos.x) ** 2 + (c.pos.y - f.pos.y) ** 2
-                collision_distance = (c.genome.radius + f.radius) ** 2
+                collision_distance = (radius + f.radius) ** 2
 
                 # if colliding, the creature gets the food's energy
                 if dist < collision_distance:
@@ -120,6 +209,7 @@ class Simulation:
         for e in eaten:
             if e.energy <= 0:
                 self.food.remove(e)
+        return candidates
 
     def handle_contact(self, c, nearby_creatures):
         # check for collisions between creatures and transfer energy
@@ -202,10 +292,16 @@ class Simulation:
         new_creatures = []
         for c in self.creatures:
             if c.can_reproduce():
-                child = c.reproduce(self.next_creature_id)
+                child = c.reproduce(self.next_creature_id, mutate_genome=not BATCH_GENOME_MUTATION)
                 self.next_creature_id += 1
                 new_creatures.append(child)
-                self.datastore.add_new_creature(child, self.time)
+                self.creature_grid.insert(child, child.pos.x, child.pos.y)  # visible to draw until the next rebuild
+        if BATCH_GENOME_MUTATION:
+            Genome.mutate_batch(child.genome for child in new_creatures)
+            for child in new_creatures:
+                child.refresh_derived()
+        for child in new_creatures:
+            self.register_birth(child)
         self.creatures.extend(new_creatures)
         return bool(new_creatures)  # returns true if creatures reproduced
 
@@ -214,17 +310,50 @@ class Simulation:
         dead_ids = set(d.id for d in dead)
         for creature in dead:
             self.energy_pool += creature.lifetime_energy_spent
-            self.datastore.mark_creature_dead(creature.id, self.time)
+            self.register_death(creature)
+        if dead:
             self.creatures = [c for c in self.creatures if c.id not in dead_ids]  # rebuilding is faster then removing
         return bool(dead)  # returns true if creatures died
 
+    def register_birth(self, creature):
+        """ Record a new creature in telemetry and running population stats """
+        self.datastore.add_new_creature(creature, self.time)
+        self.population_stats.add(creature)
+        if self.lineage is not None:
+            self.lineage.add_creature(creature.id, creature.parent, self.time)
+
+    def register_death(self, creature):
+        """ Record a creature's death in telemetry and running population stats """
+        self.datastore.mark_creature_dead(creature.id, self.time)
+        self.population_stats.remove(creature)
+        if self.lineage is not None:
+            self.lineage.mark_creature_dead(creature.id, self.time)
+
+    def gene_matrix(self):
+        """ Gene values of the living population, one row per creature (in self.creatures order), columns in Genome.gene_names order """
+        return Genome.matrix(c.genome for c in self.creatures)
+
     def food_list(self):
         return self.food
 
     def get_creature(self, world_pos):
+        """ The creature under a world position (the closest one if several overlap it), or None """
         tolerance = 50
-        for c in self.creatures:
-            dist = (c.pos.x - world_pos[0]) ** 2 + (c.pos.y - world_pos[1]) ** 2
-            if dist <= c.genome.radius ** 2 + tolerance:
-                return c
-        return None
+        x, y = world_pos
+        # widest reach of any creature, plus how far creatures can move after the grid is built
+        reach = math.sqrt(Genome.gene_metadata["radius"]["max"] ** 2 + tolerance) + RENDER_CULL_MARGIN
+
+        picked = None
+        picked_dist = None
+        for c in self.creature_grid.query_point(x, y, reach):
+            dist = (c.pos.x - x) ** 2 + (c.pos.y - y) ** 2
+            if c.energy > 0 and dist <= c.genome.radius ** 2 + tolerance and (picked is None or dist < picked_dist):
+                picked = c
+                picked_dist = dist
+        return picked
+
+    def nearest_creature(self, world_pos, exclude=()):
+        """ The living creature closest to a world position, skipping creatures whose id is in exclude """
+        return self.creature_grid.nearest(
+            world_pos[0], world_pos[1], predicate=lambda c: c.energy > 0 and c.id not in exclude
+        )
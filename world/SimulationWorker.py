@@ -0,0 +1,72 @@
+import os
+import random
+import time
+
+from config import SIMULATION_WIDTH, SIMULATION_HEIGHT, SNAPSHOT_PUBLISH_INTERVAL
+
+FIXED_DT = 1.0 / 60.0  # Same fixed tick as main.py
+IDLE_SLEEP = 0.005  # seconds to sleep per loop while paused or stopped
+
+
+def run_worker(seed, snapshot_name, max_creatures, max_food, conn, telemetry=True):
+    """
+    Entry point of the simulation process used by viewer.py.
+    Ticks the simulation as fast as possible, publishes snapshots to shared memory every SNAPSHOT_PUBLISH_INTERVAL
+    wall seconds, and handles commands from the viewer over conn:
+        ("pause", bool), ("click", world_x, world_y), ("follow", id or None), ("stop_at_hour",), ("quit",)
+    Clicks are answered with ("selected", id or None). ("stopped",) is sent once the datastore is saved.
+    """
+    # Sprites are converted for the display, so the worker needs a hidden display of its own
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    import pygame
+    from world.Simulation import Simulation
+    from world.SharedSnapshot import SharedSnapshot
+    from telemetry.SimulationDatastore import SimulationDatastore
+    from telemetry.NullDatastore import NullDatastore
+
+    random.seed(seed)
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    datastore = SimulationDatastore() if telemetry else NullDatastore()
+    simulation = Simulation(SIMULATION_WIDTH, SIMULATION_HEIGHT, datastore)
+    simulation.initialize()
+    snapshot = SharedSnapshot.attach(snapshot_name, max_creatures, max_food)
+
+    paused = False
+    followed = None
+    tick = 0
+    last_publish = 0.0
+    running = True
+    try:
+        while running:
+            while conn.poll():
+                command = conn.recv()
+                if command[0] == "pause":
+                    paused = command[1]
+                elif command[0] == "click":
+                    creature = simulation.get_creature((command[1], command[2]))
+                    conn.send(("selected", creature.id if creature else None))
+                elif command[0] == "follow":
+                    followed = command[1]
+                elif command[0] == "stop_at_hour":
+                    simulation.stop_at_hour = not simulation.stop_at_hour
+                elif command[0] == "quit":
+                    running = False
+
+            finished = simulation.stop_at_hour and simulation.time > 60 * 60
+            if paused or finished:
+                time.sleep(IDLE_SLEEP)
+            else:
+                simulation.update(FIXED_DT)
+                tick += 1
+
+            now = time.perf_counter()
+            if now - last_publish >= SNAPSHOT_PUBLISH_INTERVAL:
+                last_publish = now
+                snapshot.publish(simulation, tick, paused, followed)
+    finally:
+        datastore.close()
+        snapshot.close()
+        pygame.quit()
+        conn.send(("stopped",))
@@ -0,0 +1,128 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+from config import SPRITE_CACHE_BYTES, SPRITE_TINT_CACHE_BYTES, SPRITE_ANGLE_STEPS, SPRITE_ZOOM_STEP
+
+
+def square_frame(image):
+    """ Crop an image to its visible pixels and centre it on a square transparent surface """
+    cropped = image.subsurface(image.get_bounding_rect())
+    width, height = cropped.get_size()
+    size = max(width, height)
+    square_surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    square_surface.blit(cropped, ((size - width) // 2, (size - height) // 2))
+    return square_surface
+
+
+def surface_bytes(surface):
+    return surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+
+class SpriteCache:
+    """
+    LRU cache of tinted, scaled and rotated sprites.
+    Entries are keyed by (colour, frame, diameter, angle step, zoom step), so drawing is a lookup and a blit.
+    Angles are rounded to 360 / angle_steps degrees and zoom to powers of zoom_step.
+    The diameter is the whole-pixel size the sprite is scaled to, so it is never rounded further.
+    The limits are in bytes, since zoom is baked into each surface and a sprite at high zoom can be megabytes.
+    A sprite bigger than the whole budget is returned without being cached.
+    """
+
+    def __init__(self, frames, palette, capacity=SPRITE_CACHE_BYTES, tint_capacity=SPRITE_TINT_CACHE_BYTES,
+                 angle_steps=SPRITE_ANGLE_STEPS, zoom_step=SPRITE_ZOOM_STEP):
+        self.frames = [square_frame(frame) for frame in frames]
+        self.palette = palette  # colours in the frames that are replaced by the tint
+        self.capacity = capacity  # bytes of rendered sprites
+        self.tint_capacity = tint_capacity  # bytes of tinted, unscaled frames
+        self.angle_steps = angle_steps
+        self._log_zoom_step = math.log(zoom_step)
+        self.zoom_step = zoom_step
+
+        self._entries = OrderedDict()
+        self._tinted = {}
+        self.bytes = 0  # held by _entries
+        self._tinted_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def key(self, color, frame, diameter, angle, zoom):
+        angle_step = round(angle % 360 * self.angle_steps / 360) % self.angle_steps
+        zoom_step = round(math.log(zoom) / self._log_zoom_step)
+        return color, frame, diameter, angle_step, zoom_step
+
+    def get(self, color, frame, diameter, angle, zoom):
+        """ Sprite tinted with color, scaled to diameter pixels, rotated by angle degrees and zoomed by zoom """
+        key = self.key(color, frame, diameter, angle, zoom)
+        surface = self._entries.get(key)
+        if surface is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self._render(key)
+        size = surface_bytes(surface)
+        if size > self.capacity:
+            return surface
+        self._entries[key] = surface
+        self.bytes += size
+        while self.bytes > self.capacity:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def _tint(self, color, frame):
+        key = (color, frame)
+        surface = self._tinted.get(key)
+        if surface is None:
+            surface = self.frames[frame].copy()
+            pixel_array = pygame.PixelArray(surface)
+            for palette_color in self.palette:
+                pixel_array.replace(palette_color, color)
+            del pixel_array
+            size = surface_bytes(surface)
+            if self._tinted_bytes + size > self.tint_capacity:
+                self._tinted.clear()
+                self._tinted_bytes = 0
+            self._tinted[key] = surface
+            self._tinted_bytes += size
+        return surface
+
+    def _render(self, key):
+        color, frame, diameter, angle_step, zoom_step = key
+        scaled = pygame.transform.smoothscale(self._tint(color, frame), (diameter, diameter))
+        angle = angle_step * 360 / self.angle_steps
+        return pygame.transform.rotozoom(scaled, angle, self.zoom_step ** zoom_step)
+
+    def clear(self):
+        self._entries.clear()
+        self._tinted.clear()
+        self.bytes = 0
+        self._tinted_bytes = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
+
+    def surfaces(self):
+        """ Every surface held by the cache, for memory accounting """
+        return list(self.frames) + list(self._tinted.values()) + list(self._entries.values())